@@ -5,15 +5,103 @@ Fetch historical data from OANDA and save to CSV
 
 import sys
 import os
+import time
 import argparse
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # pyarrow is optional, fall back to pandas' CSV writer
+    pacsv = None
+
 # Add project root to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from src.api.oanda_client import OandaClient
+from src.api.oanda_client import OandaClient, CANDLE_COLUMNS
+from src.utils.data_index import update_index
+from src.utils.time_format import format_utc_times
+
+# Maximum number of candle requests in flight at once (OANDA rate limits)
+MAX_CONCURRENT_REQUESTS = 8
+
+# Candle length in seconds per OANDA granularity (weeks/months are
+# approximate, which only affects window sizing, never correctness)
+GRANULARITY_SECONDS = {
+    'S5': 5,
+    'S10': 10,
+    'S15': 15,
+    'S30': 30,
+    'M1': 60,
+    'M2': 120,
+    'M4': 240,
+    'M5': 300,
+    'M10': 600,
+    'M15': 900,
+    'M30': 1800,
+    'H1': 3600,
+    'H2': 7200,
+    'H3': 10800,
+    'H4': 14400,
+    'H6': 21600,
+    'H8': 28800,
+    'H12': 43200,
+    'D': 86400,
+    'W': 604800,
+    'M': 2592000
+}
+
+
+def _granularity_seconds(granularity: str) -> int:
+    """
+    Candle length of a granularity in seconds
+    
+    Args:
+        granularity: Timeframe (e.g. 'H1')
+    
+    Returns:
+        Seconds per candle
+    
+    Raises:
+        ValueError: If the granularity is not an OANDA granularity
+    """
+    try:
+        return GRANULARITY_SECONDS[granularity]
+    except KeyError:
+        raise ValueError(f"Unknown granularity: {granularity}") from None
+
+
+def _request_windows(start_ts: int, end_ts: int, gran_secs: int,
+                     max_per_request: int) -> list:
+    """
+    Split [start_ts, end_ts) into request windows of at most max_per_request candles
+    
+    Windows are contiguous and disjoint ([lo, lo + step - 1s]), so each
+    candle is returned by exactly one request.
+    
+    Args:
+        start_ts: First UNIX timestamp to cover
+        end_ts: End of the range (exclusive)
+        gran_secs: Candle length in seconds
+        max_per_request: Maximum candles per request
+    
+    Returns:
+        List of (from_ts, to_ts) pairs, to_ts inclusive
+    """
+    step = max_per_request * gran_secs
+    return [
+        (lo, min(lo + step, end_ts) - 1)
+        for lo in range(start_ts, end_ts, step)
+    ]
+
+
+def _to_rfc3339(timestamp: int) -> str:
+    """Format a UNIX timestamp as an RFC3339 UTC string for the OANDA API"""
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
 
 
 def fetch_historical_data(
@@ -34,28 +122,20 @@ def fetch_historical_data(
     Returns:
         DataFrame with OHLC data
     """
+    if days <= 0:
+        return pd.DataFrame()
+    
     print(f"\nFetching {days} days of {instrument} data ({granularity})...")
     
     client = OandaClient(account_type=account_type)
     
     # OANDA allows max 5000 candles per request
     # Calculate how many requests we need
-    candles_per_day = {
-        'M1': 1440,   # 1 minute
-        'M5': 288,    # 5 minutes
-        'M15': 96,    # 15 minutes
-        'M30': 48,    # 30 minutes
-        'H1': 24,     # 1 hour
-        'H4': 6,      # 4 hours
-        'D': 1,       # Daily
-        'W': 1/7,     # Weekly
-        'M': 1/30     # Monthly
-    }
-    
-    total_candles_needed = int(days * candles_per_day.get(granularity, 24))
+    gran_secs = _granularity_seconds(granularity)
+    total_candles_needed = int(days * 86400 // gran_secs)
     max_per_request = 5000
     
-    all_candles = []
+    chunks = []
     
     if total_candles_needed <= max_per_request:
         # Single request
@@ -64,42 +144,50 @@ def fetch_historical_data(
             granularity=granularity,
             count=total_candles_needed
         )
-        all_candles.extend(candles)
+        chunks.append(candles)
     else:
-        # Multiple requests needed
-        num_requests = (total_candles_needed // max_per_request) + 1
+        # Multiple requests needed, over disjoint windows ending at the
+        # current candle boundary
+        end_ts = int(time.time()) // gran_secs * gran_secs
+        start_ts = end_ts - days * 86400
+        windows = _request_windows(start_ts, end_ts, gran_secs, max_per_request)
+        num_requests = len(windows)
         print(f"  Need {num_requests} requests to fetch all data...")
         
-        # Start from today and go backwards
-        to_time = datetime.utcnow()
-        
-        for i in range(num_requests):
-            from_time = to_time - timedelta(days=days/num_requests)
-            
-            candles = client.get_candles(
+        def fetch_window(window):
+            from_ts, to_ts = window
+            return client.get_candles(
                 instrument=instrument,
                 granularity=granularity,
-                count=max_per_request,
-                from_time=from_time.isoformat() + 'Z',
-                to_time=to_time.isoformat() + 'Z'
+                from_time=_to_rfc3339(from_ts),
+                to_time=_to_rfc3339(to_ts)
             )
+        
+        workers = min(MAX_CONCURRENT_REQUESTS, num_requests)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(fetch_window, w) for w in windows]
             
-            all_candles.extend(candles)
-            to_time = from_time
-            
-            print(f"  Progress: {i+1}/{num_requests} requests complete")
+            for i, future in enumerate(as_completed(futures)):
+                chunks.append(future.result())
+                print(f"  Progress: {i+1}/{num_requests} requests complete")
+    
+    chunks = [c for c in chunks if c and len(c['time']) > 0]
     
-    if not all_candles:
+    if not chunks:
         print("  ✗ No data fetched!")
         return pd.DataFrame()
     
-    # Convert to DataFrame
-    df = pd.DataFrame(all_candles)
-    df['time'] = pd.to_datetime(df['time'])
-    df = df.sort_values('time').reset_index(drop=True)
+    # Merge the column arrays of all chunks, ordered by time (requests
+    # complete out of order, but their windows never overlap)
+    times = np.concatenate([c['time'] for c in chunks])
+    order = np.argsort(times, kind='stable')
     
-    # Remove duplicates (can happen at request boundaries)
-    df = df.drop_duplicates(subset=['time']).reset_index(drop=True)
+    columns = {'time': pd.to_datetime(times[order], utc=True)}
+    for col in CANDLE_COLUMNS[1:]:
+        columns[col] = np.concatenate([c[col] for c in chunks])[order]
+    
+    # The column arrays are freshly allocated, so pandas can adopt them as-is
+    df = pd.DataFrame(columns, copy=False)
     
     print(f"  ✓ Fetched {len(df)} candles")
     print(f"  Date range: {df['time'].min()} to {df['time'].max()}")
@@ -107,9 +195,29 @@ def fetch_historical_data(
     return df
 
 
+def _write_csv_arrow(df: pd.DataFrame, times: np.ndarray, filepath: Path) -> None:
+    """
+    Write a frame to CSV with pyarrow, in the same layout as df.to_csv
+    
+    Args:
+        df: DataFrame to write
+        times: Preformatted time column (see format_utc_times)
+        filepath: Destination path
+    """
+    table = pa.Table.from_pandas(df.assign(time=times), preserve_index=False)
+    
+    # pyarrow quotes header names, so write the header line ourselves
+    with open(filepath, 'wb') as f:
+        f.write((','.join(map(str, df.columns)) + '\n').encode())
+        pacsv.write_csv(table, f, write_options=pacsv.WriteOptions(
+            include_header=False,
+            quoting_style='none'
+        ))
+
+
 def save_to_csv(df: pd.DataFrame, instrument: str, granularity: str):
     """
-    Save DataFrame to CSV file
+    Save DataFrame to CSV file, plus a Parquet snapshot when pyarrow is installed
     
     Args:
         df: DataFrame with OHLC data
@@ -124,12 +232,30 @@ def save_to_csv(df: pd.DataFrame, instrument: str, granularity: str):
     filename = f"{instrument}_{granularity}_{datetime.now().strftime('%Y%m%d')}.csv"
     filepath = data_dir / filename
     
-    # Save to CSV
-    df.to_csv(filepath, index=False)
+    # Save to CSV (pyarrow's writer is multithreaded and much faster;
+    # times are preformatted so the file reads the same either way)
+    times = format_utc_times(df['time']) if pacsv is not None else None
+    if times is not None:
+        _write_csv_arrow(df, times, filepath)
+    else:
+        df.to_csv(filepath, index=False)
     
     print(f"\n  ✓ Saved to: {filepath}")
     print(f"  File size: {filepath.stat().st_size / 1024:.1f} KB")
     
+    # Also save a Parquet snapshot, which reloads much faster for backtests
+    latest_path = filepath
+    if pacsv is not None:
+        parquet_path = filepath.with_suffix('.parquet')
+        df.to_parquet(parquet_path, engine='pyarrow', compression='snappy', index=False)
+        latest_path = parquet_path
+        
+        print(f"  ✓ Saved to: {parquet_path}")
+        print(f"  File size: {parquet_path.stat().st_size / 1024:.1f} KB")
+    
+    # Record the new file so the strategy tester finds it without a scan
+    update_index(data_dir, instrument, latest_path)
+    
     return filepath
 
 
@@ -9,14 +9,22 @@ to generate and analyze trading signals.
 import sys
 import os
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import pandas as pd
 import json
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # pyarrow is optional, fall back to pandas' CSV parser
+    pacsv = None
+
 # Add project root to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from src.strategies.sma_crossover import SMACrossoverStrategy
+from src.utils.data_index import lookup_index
 
 
 def find_latest_data_file(instrument: str = 'EUR_USD') -> Path:
@@ -34,8 +42,20 @@ def find_latest_data_file(instrument: str = 'EUR_USD') -> Path:
     if not data_dir.exists():
         raise FileNotFoundError(f"Data directory not found: {data_dir}")
     
-    # Find all files matching the instrument
-    files = list(data_dir.glob(f"{instrument}_*.csv"))
+    # Use the index written by fetch_data.py when it is up to date
+    indexed = lookup_index(data_dir, instrument)
+    if indexed is not None:
+        return indexed
+    
+    # Otherwise find all files matching the instrument in a single directory pass;
+    # DirEntry caches its stat result so each file is stat'ed only once
+    prefix = f"{instrument}_"
+    files = {}
+    with os.scandir(data_dir) as entries:
+        for entry in entries:
+            stem, suffix = os.path.splitext(entry.name)
+            if entry.name.startswith(prefix) and suffix in ('.parquet', '.csv'):
+                files[stem, suffix] = entry
     
     if not files:
         raise FileNotFoundError(
@@ -43,25 +63,64 @@ def find_latest_data_file(instrument: str = 'EUR_USD') -> Path:
             f"Run 'python scripts/fetch_data.py' first."
         )
     
-    # Return the most recent file
-    latest = max(files, key=lambda p: p.stat().st_mtime)
-    return latest
+    # Return the most recent file, whichever format it is in; a CSV is
+    # swapped for its Parquet snapshot (same name), which loads faster
+    (stem, suffix), latest = max(files.items(), key=lambda item: item[1].stat().st_mtime)
+    if suffix == '.csv':
+        latest = files.get((stem, '.parquet'), latest)
+    return Path(latest.path)
 
 
 def load_data(filepath: Path) -> pd.DataFrame:
     """
-    Load historical data from CSV
+    Load historical data from a Parquet or CSV file
     
     Args:
-        filepath: Path to CSV file
+        filepath: Path to Parquet or CSV file
         
     Returns:
         DataFrame with OHLC data
     """
     print(f"\nLoading data from: {filepath}")
     
-    df = pd.read_csv(filepath)
-    df['time'] = pd.to_datetime(df['time'])
+    if filepath.suffix == '.parquet':
+        df = pd.read_parquet(filepath)
+    elif pacsv is not None:
+        # Multithreaded parse; the time column type is inferred so files
+        # with and without a UTC offset both load
+        convert_options = pacsv.ConvertOptions(column_types={
+            'open': pa.float64(),
+            'high': pa.float64(),
+            'low': pa.float64(),
+            'close': pa.float64(),
+            'volume': pa.int64()
+        })
+        df = pacsv.read_csv(str(filepath), convert_options=convert_options).to_pandas()
+    else:
+        # Parse timestamps and numeric columns in a single pass; ISO8601
+        # covers the timestamps written by both df.to_csv and
+        # fetch_data's pyarrow writer (_write_csv_arrow)
+        df = pd.read_csv(
+            filepath,
+            parse_dates=['time'],
+            date_format='ISO8601',
+            dtype={
+                'open': 'f8',
+                'high': 'f8',
+                'low': 'f8',
+                'close': 'f8',
+                'volume': 'i8'
+            }
+        )
+    
+    # Safety net for files whose timestamps the parsers could not type
+    if not pd.api.types.is_datetime64_any_dtype(df['time']):
+        df['time'] = pd.to_datetime(df['time'])
+    
+    # Each loader picks its own resolution (pyarrow: s, pandas: us,
+    # Parquet: ns); use nanoseconds like fetch_historical_data
+    if df['time'].dt.unit != 'ns':
+        df['time'] = df['time'].dt.as_unit('ns')
     
     print(f"  ✓ Loaded {len(df)} candles")
     print(f"  Date range: {df['time'].min()} to {df['time'].max()}")
@@ -70,6 +129,18 @@ def load_data(filepath: Path) -> pd.DataFrame:
     return df
 
 
+def _write_json(filepath: Path, data: dict) -> None:
+    """
+    Write a dictionary to a JSON file
+    
+    Args:
+        filepath: Destination path
+        data: Dictionary to serialize (non-JSON values are stringified)
+    """
+    with open(filepath, 'w') as f:
+        json.dump(data, f, indent=2, default=str)
+
+
 def print_signals(strategy: SMACrossoverStrategy, max_display: int = 10):
     """
     Print trading signals in a readable format
@@ -88,14 +159,14 @@ def print_signals(strategy: SMACrossoverStrategy, max_display: int = 10):
     print(f" TRADING SIGNALS (showing {min(max_display, len(signals))} of {len(signals)})")
     print(f"{'='*80}\n")
     
-    for i, (idx, row) in enumerate(signals.head(max_display).iterrows()):
-        signal_type = "🟢 BUY " if row['signal'] == 1 else "🔴 SELL"
+    for i, row in enumerate(signals.head(max_display).itertuples(index=False)):
+        signal_type = "🟢 BUY " if row.signal == 1 else "🔴 SELL"
         print(f"{i+1}. {signal_type}")
-        print(f"   Time: {row['time']}")
-        print(f"   Price: {row['close']:.5f}")
-        print(f"   SMA{strategy.short_period}: {row['sma_short']:.5f}")
-        print(f"   SMA{strategy.long_period}: {row['sma_long']:.5f}")
-        print(f"   Signal Strength: {row['signal_strength']:.3f}%")
+        print(f"   Time: {row.time}")
+        print(f"   Price: {row.close:.5f}")
+        print(f"   SMA{strategy.short_period}: {row.sma_short:.5f}")
+        print(f"   SMA{strategy.long_period}: {row.sma_long:.5f}")
+        print(f"   Signal Strength: {row.signal_strength:.3f}%")
         print()
 
 
@@ -118,12 +189,12 @@ def print_trade_analysis(strategy: SMACrossoverStrategy):
     
     # Show first few trades
     print(f"Sample Trades (first 5):\n")
-    for i, (idx, trade) in enumerate(trades.head(5).iterrows()):
-        profit_emoji = "✅" if trade['pips_profit'] > 0 else "❌"
-        print(f"{i+1}. {profit_emoji} {trade['position_type'].upper()}")
-        print(f"   Entry:  {trade['entry_time']} @ {trade['entry_price']:.5f}")
-        print(f"   Exit:   {trade['exit_time']} @ {trade['exit_price']:.5f}")
-        print(f"   Profit: {trade['pips_profit']:.1f} pips ({trade['percent_profit']:.2f}%)")
+    for i, trade in enumerate(trades.head(5).itertuples(index=False)):
+        profit_emoji = "✅" if trade.pips_profit > 0 else "❌"
+        print(f"{i+1}. {profit_emoji} {trade.position_type.upper()}")
+        print(f"   Entry:  {trade.entry_time} @ {trade.entry_price:.5f}")
+        print(f"   Exit:   {trade.exit_time} @ {trade.exit_price:.5f}")
+        print(f"   Profit: {trade.pips_profit:.1f} pips ({trade.percent_profit:.2f}%)")
         print()
     
     # Performance summary
@@ -223,23 +294,29 @@ def main():
             output_dir = Path('data/trades')
             output_dir.mkdir(parents=True, exist_ok=True)
             
-            # Export signals
+            # Export signals, trades and performance summary
             signals_file = output_dir / f"{args.pair}_signals_SMA{args.short}_{args.long}.csv"
-            strategy.export_signals(str(signals_file))
-            print(f"\n  ✓ Signals exported to: {signals_file}")
+            trades_file = output_dir / f"{args.pair}_trades_SMA{args.short}_{args.long}.csv"
+            perf_file = output_dir / f"{args.pair}_performance_SMA{args.short}_{args.long}.json"
             
-            # Export trades
             trades = strategy.get_entry_exit_pairs()
+            perf = strategy.get_performance_summary()
+            
+            # The three files are independent, so write them concurrently
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                futures = [
+                    executor.submit(strategy.export_signals, str(signals_file)),
+                    executor.submit(_write_json, perf_file, perf)
+                ]
+                if len(trades) > 0:
+                    futures.append(executor.submit(trades.to_csv, trades_file, index=False))
+                
+                for future in futures:
+                    future.result()
+            
+            print(f"\n  ✓ Signals exported to: {signals_file}")
             if len(trades) > 0:
-                trades_file = output_dir / f"{args.pair}_trades_SMA{args.short}_{args.long}.csv"
-                trades.to_csv(trades_file, index=False)
                 print(f"  ✓ Trades exported to: {trades_file}")
-            
-            # Export performance summary
-            perf = strategy.get_performance_summary()
-            perf_file = output_dir / f"{args.pair}_performance_SMA{args.short}_{args.long}.json"
-            with open(perf_file, 'w') as f:
-                json.dump(perf, f, indent=2, default=str)
             print(f"  ✓ Performance summary exported to: {perf_file}")
         
         print("\n" + "="*80)
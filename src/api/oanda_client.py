@@ -4,13 +4,17 @@ Handles all interactions with the OANDA v20 REST API
 """
 
 import os
+import time
 import logging
+import threading
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import json
 
+import numpy as np
 import oandapyV20
 from oandapyV20 import API
+from oandapyV20.oandapyV20 import TRADING_ENVIRONMENTS
 from oandapyV20.exceptions import V20Error
 import oandapyV20.endpoints.accounts as accounts
 import oandapyV20.endpoints.pricing as pricing
@@ -20,6 +24,19 @@ import oandapyV20.endpoints.trades as trades
 import oandapyV20.endpoints.positions as positions
 
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional, fall back to the stdlib parser
+    _json_loads = json.loads
+
+try:
+    import ijson
+except ImportError:  # ijson is optional, only used by get_candles(stream_parse=True)
+    ijson = None
 
 # Load environment variables
 load_dotenv()
@@ -31,6 +48,61 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Seconds that account lookups are served from cache
+ACCOUNT_CACHE_TTL = 2.0
+
+# Column order of the arrays returned by OandaClient.get_candles
+CANDLE_COLUMNS = ['time', 'volume', 'open', 'high', 'low', 'close']
+
+
+class _API(API):
+    """
+    oandapyV20 API client that decodes REST responses with orjson
+    
+    Streaming endpoints are handled by the stock implementation.
+    """
+    
+    def request(self, endpoint):
+        """Perform a request for an APIRequest instance and decode the JSON body"""
+        if getattr(endpoint, 'STREAM', False):
+            return super().request(endpoint)
+        
+        response = self.request_raw(endpoint)
+        content = _json_loads(response.content)
+        
+        endpoint.response = content
+        endpoint.status_code = response.status_code
+        return content
+    
+    def request_raw(self, endpoint, stream: bool = False):
+        """
+        Perform a REST request and return the undecoded requests.Response
+        
+        Args:
+            endpoint: APIRequest instance
+            stream: Defer downloading the body until it is read
+            
+        Raises:
+            V20Error in case of HTTP response code >= 400
+        """
+        method = endpoint.method.lower()
+        
+        request_args = {}
+        if method == 'get':
+            request_args['params'] = getattr(endpoint, 'params', {})
+        elif getattr(endpoint, 'data', None):
+            request_args['json'] = endpoint.data
+        request_args.update(self.request_params)
+        
+        url = f"{TRADING_ENVIRONMENTS[self.environment]['api']}/{endpoint}"
+        
+        # Reuse oandapyV20's transport so error handling stays identical
+        return self._API__request(
+            method, url, request_args,
+            headers=getattr(endpoint, 'HEADERS', {}),
+            stream=stream
+        )
+
 
 class OandaClient:
     """
@@ -74,23 +146,80 @@ class OandaClient:
         self.environment = os.getenv('OANDA_ENVIRONMENT', 'practice').lower()
         
         # Initialize API client
-        self.client = API(
+        self.client = _API(
             access_token=self.api_key,
             environment=self.environment
         )
         
+        # Keep connections alive across requests (one TLS handshake per
+        # pooled connection) and retry transient failures. Only GETs are
+        # retried so orders are never resubmitted; raise_on_status=False
+        # lets the final error response surface as a V20Error as before.
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset(['GET']),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retry)
+        self.client.client.mount('https://', adapter)
+        
+        # Short-lived cache for account lookups: key -> (timestamp, result)
+        self._account_cache: Dict[str, Tuple[float, Dict]] = {}
+        
+        # Reusable candle endpoint objects, kept per thread because every
+        # request rewrites the endpoint's params and response (one entry per
+        # instrument and granularity; the response is dropped after each call)
+        self._endpoints = threading.local()
+        
         logger.info(
-            f"Initialized OANDA client for {account_type} account "
-            f"in {self.environment} environment"
+            "Initialized OANDA client for %s account in %s environment",
+            account_type, self.environment
         )
     
+    def _get_cached(self, key: str) -> Optional[Dict]:
+        """Return a cached account lookup if it is younger than ACCOUNT_CACHE_TTL"""
+        entry = self._account_cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < ACCOUNT_CACHE_TTL:
+            return dict(entry[1])
+        return None
+    
+    def _set_cached(self, key: str, value: Dict) -> None:
+        """Store an account lookup in the cache"""
+        self._account_cache[key] = (time.monotonic(), value)
+    
+    def _get_endpoint(self, key: Tuple, factory):
+        """
+        Return this thread's cached endpoint object for key, creating it
+        with factory() on first use
+        """
+        cache = getattr(self._endpoints, 'cache', None)
+        if cache is None:
+            cache = self._endpoints.cache = {}
+        
+        endpoint = cache.get(key)
+        if endpoint is None:
+            endpoint = cache[key] = factory()
+        return endpoint
+    
+    def invalidate_account_cache(self) -> None:
+        """Drop cached account lookups (called after orders and trade closes)"""
+        self._account_cache.clear()
+    
     def test_connection(self) -> Dict:
         """
         Test API connection and retrieve account information
         
+        Successful results are cached for ACCOUNT_CACHE_TTL seconds.
+        
         Returns:
             Dictionary with account details
         """
+        cached = self._get_cached('connection')
+        if cached is not None:
+            return cached
+        
         try:
             # Request account details
             r = accounts.AccountDetails(accountID=self.account_id)
@@ -98,16 +227,17 @@ class OandaClient:
             
             account_info = response['account']
             
-            logger.info(
-                f"✓ Successfully connected to OANDA API\n"
-                f"  Account ID: {account_info['id']}\n"
-                f"  Balance: ${float(account_info['balance']):,.2f}\n"
-                f"  Currency: {account_info['currency']}\n"
-                f"  Open Trades: {len(account_info.get('trades', []))}\n"
-                f"  Open Positions: {len(account_info.get('positions', []))}"
-            )
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    f"✓ Successfully connected to OANDA API\n"
+                    f"  Account ID: {account_info['id']}\n"
+                    f"  Balance: ${float(account_info['balance']):,.2f}\n"
+                    f"  Currency: {account_info['currency']}\n"
+                    f"  Open Trades: {len(account_info.get('trades', []))}\n"
+                    f"  Open Positions: {len(account_info.get('positions', []))}"
+                )
             
-            return {
+            result = {
                 'success': True,
                 'account_id': account_info['id'],
                 'balance': float(account_info['balance']),
@@ -117,15 +247,18 @@ class OandaClient:
                 'unrealized_pl': float(account_info.get('unrealizedPL', 0)),
                 'nav': float(account_info.get('NAV', 0))
             }
+            self._set_cached('connection', result)
+            
+            return dict(result)
             
         except V20Error as e:
-            logger.error(f"✗ Failed to connect to OANDA API: {e}")
+            logger.error("✗ Failed to connect to OANDA API: %s", e)
             return {
                 'success': False,
                 'error': str(e)
             }
         except Exception as e:
-            logger.error(f"✗ Unexpected error: {e}")
+            logger.error("✗ Unexpected error: %s", e)
             return {
                 'success': False,
                 'error': str(e)
@@ -135,15 +268,22 @@ class OandaClient:
         """
         Get detailed account summary
         
+        Results are cached for ACCOUNT_CACHE_TTL seconds.
+        
         Returns:
             Dictionary with account summary
         """
+        cached = self._get_cached('summary')
+        if cached is not None:
+            return cached
+        
         try:
             r = accounts.AccountSummary(accountID=self.account_id)
             response = self.client.request(r)
-            return response['account']
+            self._set_cached('summary', response['account'])
+            return dict(response['account'])
         except V20Error as e:
-            logger.error(f"Error fetching account summary: {e}")
+            logger.error("Error fetching account summary: %s", e)
             return {}
     
     def get_current_price(self, instrument: str = 'EUR_USD') -> Optional[Dict]:
@@ -156,29 +296,50 @@ class OandaClient:
         Returns:
             Dictionary with bid, ask, and mid prices
         """
+        return self.get_current_prices([instrument]).get(instrument)
+    
+    def get_current_prices(self, instruments: List[str]) -> Dict[str, Dict]:
+        """
+        Get current bid/ask prices for several instruments in one request
+        
+        Args:
+            instruments: Currency pairs (e.g., ['EUR_USD', 'GBP_USD'])
+            
+        Returns:
+            Dictionary of instrument -> price dictionary (see get_current_price);
+            empty on error or if no instruments are given
+        """
+        if not instruments:
+            return {}
+        
         try:
-            params = {
-                'instruments': instrument
-            }
-            r = pricing.PricingInfo(accountID=self.account_id, params=params)
+            joined = ','.join(instruments)
+            # Built per call: its constructor is trivial next to the request,
+            # and caching one per instrument list would grow without bound
+            r = pricing.PricingInfo(
+                accountID=self.account_id, params={'instruments': joined}
+            )
             response = self.client.request(r)
             
-            price_data = response['prices'][0]
+            prices = {}
+            for price_data in response['prices']:
+                bid = float(price_data['bids'][0]['price'])
+                ask = float(price_data['asks'][0]['price'])
+                
+                prices[price_data['instrument']] = {
+                    'instrument': price_data['instrument'],
+                    'time': price_data['time'],
+                    'bid': bid,
+                    'ask': ask,
+                    'mid': (bid + ask) / 2,
+                    'spread': ask - bid
+                }
             
-            return {
-                'instrument': instrument,
-                'time': price_data['time'],
-                'bid': float(price_data['bids'][0]['price']),
-                'ask': float(price_data['asks'][0]['price']),
-                'mid': (float(price_data['bids'][0]['price']) + 
-                       float(price_data['asks'][0]['price'])) / 2,
-                'spread': float(price_data['asks'][0]['price']) - 
-                         float(price_data['bids'][0]['price'])
-            }
+            return prices
             
         except V20Error as e:
-            logger.error(f"Error fetching price for {instrument}: {e}")
-            return None
+            logger.error("Error fetching prices for %s: %s", joined, e)
+            return {}
     
     def get_candles(
         self, 
@@ -186,25 +347,33 @@ class OandaClient:
         granularity: str = 'H1',
         count: int = 500,
         from_time: Optional[str] = None,
-        to_time: Optional[str] = None
-    ) -> List[Dict]:
+        to_time: Optional[str] = None,
+        stream_parse: bool = False
+    ) -> Dict[str, np.ndarray]:
         """
         Fetch historical candlestick data
         
         Args:
             instrument: Currency pair (e.g., 'EUR_USD')
             granularity: Timeframe (S5, M1, M5, M15, M30, H1, H4, D, W, M)
-            count: Number of candles to fetch (max 5000)
+            count: Number of candles to fetch (max 5000, ignored when both
+                from_time and to_time are given)
             from_time: Start time in RFC3339 format
             to_time: End time in RFC3339 format
+            stream_parse: Parse the candles with ijson while the body is
+                still downloading. Only pays off on slow links: ijson is
+                several times slower than decoding the whole body with
+                orjson. Ignored when ijson is not installed
             
         Returns:
-            List of candle dictionaries
+            Dictionary of column arrays (time, volume, open, high, low, close),
+            or an empty dictionary on error. This is one array per column,
+            not a list of candle dictionaries: len(candles['time']) is the
+            number of candles, and pd.DataFrame(candles) builds a frame
         """
         try:
             params = {
-                'granularity': granularity,
-                'count': min(count, 5000)  # OANDA max is 5000
+                'granularity': granularity
             }
             
             if from_time:
@@ -212,31 +381,61 @@ class OandaClient:
             if to_time:
                 params['to'] = to_time
             
-            r = instruments.InstrumentsCandles(instrument=instrument, params=params)
-            response = self.client.request(r)
-            
-            candles = []
-            for candle in response['candles']:
-                if candle['complete']:  # Only use complete candles
-                    candles.append({
-                        'time': candle['time'],
-                        'volume': int(candle['volume']),
-                        'open': float(candle['mid']['o']),
-                        'high': float(candle['mid']['h']),
-                        'low': float(candle['mid']['l']),
-                        'close': float(candle['mid']['c'])
-                    })
+            # OANDA rejects count when the range is fully specified
+            if not (from_time and to_time):
+                params['count'] = min(count, 5000)  # OANDA max is 5000
             
-            logger.info(
-                f"Fetched {len(candles)} candles for {instrument} "
-                f"({granularity})"
+            r = self._get_endpoint(
+                ('candles', instrument, granularity),
+                lambda: instruments.InstrumentsCandles(instrument=instrument, params={})
             )
+            r.params.clear()
+            r.params.update(params)
+            
+            # Only use complete candles; they are filtered once, before any
+            # field is converted
+            if stream_parse and ijson is not None:
+                # Parse candles incrementally while the body is still arriving
+                response = self.client.request_raw(r, stream=True)
+                try:
+                    response.raw.decode_content = True  # gunzip on the fly
+                    complete = [
+                        c for c in ijson.items(response.raw, 'candles.item')
+                        if c['complete']
+                    ]
+                finally:
+                    response.close()
+            else:
+                complete = [
+                    c for c in self.client.request(r)['candles']
+                    if c['complete']
+                ]
+                # Don't keep the decoded body alive on the cached endpoint
+                r.response = None
+            k = len(complete)
+            
+            # Coerce each column in C instead of calling float() per field
+            candles = {
+                'time': np.array(
+                    [c['time'].rstrip('Z') for c in complete],
+                    dtype='datetime64[ns]'
+                ),  # RFC3339, always UTC
+                'volume': np.fromiter(
+                    (c['volume'] for c in complete), dtype=np.int64, count=k
+                )
+            }
+            for col, key in [('open', 'o'), ('high', 'h'), ('low', 'l'), ('close', 'c')]:
+                candles[col] = np.fromiter(
+                    (c['mid'][key] for c in complete), dtype=np.float64, count=k
+                )
+            
+            logger.info("Fetched %d candles for %s (%s)", k, instrument, granularity)
             
             return candles
             
         except V20Error as e:
-            logger.error(f"Error fetching candles: {e}")
-            return []
+            logger.error("Error fetching candles: %s", e)
+            return {}
     
     def place_market_order(
         self,
@@ -282,10 +481,11 @@ class OandaClient:
             
             r = orders.OrderCreate(accountID=self.account_id, data=order_data)
             response = self.client.request(r)
+            self.invalidate_account_cache()
             
             logger.info(
-                f"Order placed: {units} units of {instrument} "
-                f"(Order ID: {response['orderFillTransaction']['id']})"
+                "Order placed: %s units of %s (Order ID: %s)",
+                units, instrument, response['orderFillTransaction']['id']
             )
             
             return {
@@ -298,7 +498,7 @@ class OandaClient:
             }
             
         except V20Error as e:
-            logger.error(f"Error placing order: {e}")
+            logger.error("Error placing order: %s", e)
             return {
                 'success': False,
                 'error': str(e)
@@ -330,7 +530,7 @@ class OandaClient:
             return open_trades
             
         except V20Error as e:
-            logger.error(f"Error fetching open trades: {e}")
+            logger.error("Error fetching open trades: %s", e)
             return []
     
     def close_trade(self, trade_id: str) -> Dict:
@@ -346,8 +546,9 @@ class OandaClient:
         try:
             r = trades.TradeClose(accountID=self.account_id, tradeID=trade_id)
             response = self.client.request(r)
+            self.invalidate_account_cache()
             
-            logger.info(f"Trade {trade_id} closed")
+            logger.info("Trade %s closed", trade_id)
             
             return {
                 'success': True,
@@ -358,7 +559,7 @@ class OandaClient:
             }
             
         except V20Error as e:
-            logger.error(f"Error closing trade {trade_id}: {e}")
+            logger.error("Error closing trade %s: %s", trade_id, e)
             return {
                 'success': False,
                 'error': str(e)
@@ -389,7 +590,7 @@ class OandaClient:
             return positions_list
             
         except V20Error as e:
-            logger.error(f"Error fetching positions: {e}")
+            logger.error("Error fetching positions: %s", e)
             return []
 
 
@@ -430,11 +631,10 @@ def main():
                 # Fetch some historical data
                 print("\nFetching last 5 H1 candles...")
                 candles = client.get_candles('EUR_USD', 'H1', count=5)
-                if candles:
-                    print(f"  Retrieved {len(candles)} candles")
-                    latest = candles[-1]
-                    print(f"  Latest close: {latest['close']:.5f}")
-                    print(f"  Time: {latest['time']}")
+                if candles and len(candles['time']) > 0:
+                    print(f"  Retrieved {len(candles['time'])} candles")
+                    print(f"  Latest close: {candles['close'][-1]:.5f}")
+                    print(f"  Time: {candles['time'][-1]}")
                 
             else:
                 print(f"✗ Connection failed: {result.get('error')}")
@@ -0,0 +1,108 @@
+"""
+Indicator Cache
+Memoizes SMA arrays across strategy runs, so parameter sweeps over the same
+price series reuse the moving averages they share
+"""
+
+import hashlib
+import threading
+from typing import Optional
+
+import numpy as np
+
+try:
+    import xxhash  # Much faster content hashing when installed
+except ImportError:
+    xxhash = None
+
+from ._kernels import sma_kernel
+
+# Maximum number of cached SMA arrays, and their maximum total size in
+# bytes; the least recently used are evicted first (the cache dict is kept
+# in use order, oldest first)
+SMA_CACHE_SIZE = 32
+SMA_CACHE_BYTES = 64 * 1024 * 1024
+
+_sma_cache = {}
+_sma_cache_bytes = 0
+_sma_lock = threading.Lock()
+
+
+def content_key(x: np.ndarray) -> tuple:
+    """
+    Build a cache key from the contents of an array
+    
+    Hashing reads the whole array, so callers computing several SMAs of
+    the same prices should build the key once and pass it to sma_cached.
+    
+    Args:
+        x: Input values
+    
+    Returns:
+        Tuple of (length, 64-bit digest)
+    """
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    buf = x.view(np.uint8)
+    if xxhash is not None:
+        digest = xxhash.xxh3_64_intdigest(buf)
+    else:
+        digest = hashlib.blake2b(buf, digest_size=8).digest()
+    return (x.shape[0], digest)
+
+
+def sma_cached(x: np.ndarray, period: int, key: Optional[tuple] = None) -> np.ndarray:
+    """
+    Simple Moving Average, memoized on the input contents and period
+    
+    Args:
+        x: Input values
+        period: Number of periods
+        key: content_key(x), if already computed
+    
+    Returns:
+        Read-only array of averages (shared between callers; copy before
+        modifying)
+    """
+    global _sma_cache_bytes
+    
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    if key is None:
+        key = content_key(x)
+    key = (key, period)
+    
+    with _sma_lock:
+        cached = _sma_cache.pop(key, None)
+        if cached is not None:
+            # Reinsert to mark it most recently used
+            _sma_cache[key] = cached
+            return cached
+    
+    result = sma_kernel(x, period)
+    result.setflags(write=False)
+    
+    if result.nbytes > SMA_CACHE_BYTES:
+        # Too large to keep without pushing out everything else
+        return result
+    
+    with _sma_lock:
+        if key not in _sma_cache:
+            while _sma_cache and (
+                len(_sma_cache) >= SMA_CACHE_SIZE
+                or _sma_cache_bytes + result.nbytes > SMA_CACHE_BYTES
+            ):
+                # Evict the least recently used entry
+                evict = next(iter(_sma_cache))
+                _sma_cache_bytes -= _sma_cache.pop(evict).nbytes
+            _sma_cache[key] = result
+            _sma_cache_bytes += result.nbytes
+    
+    return result
+
+
+def clear_sma_cache() -> None:
+    """Drop all cached SMA arrays"""
+    global _sma_cache_bytes
+    
+    with _sma_lock:
+        _sma_cache.clear()
+        _sma_cache_bytes = 0
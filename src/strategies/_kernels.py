@@ -0,0 +1,569 @@
+"""
+Numba Kernels
+Compiled single-pass loops behind the technical indicators and strategies
+"""
+
+import numpy as np
+from numba import njit, prange
+
+# Running-window states are passed as tuples of floats so that they stay in
+# registers inside the compiled loops:
+#   mean:     (nobs, neg_ct, total, comp_add, comp_remove, same_count, prev)
+#   variance: (nobs, mean, ssqdm, comp_add, comp_remove, unstable)
+# The arithmetic mirrors pandas' rolling mean/var: means are identical, and
+# variances agree to rounding (the last bits of pandas' roll_var have
+# changed between releases).
+# Like pandas' rolling and ewm, all kernels treat +/-inf as missing (NaN).
+
+# An update that leaves fewer than ~3 significant digits of the squared
+# deviations triggers a recompute of the variance window
+_INV_COND_TOL = np.finfo(np.float64).eps * 1e3
+
+
+@njit(cache=True)
+def _window_add(state, value: float):
+    """Add a value entering the mean window (NaN and inf are skipped)"""
+    if not np.isfinite(value):
+        return state
+    nobs, neg_ct, total, comp_add, comp_remove, same_count, prev = state
+    
+    nobs += 1
+    y = value - comp_add
+    t = total + y
+    comp_add = t - total - y
+    total = t
+    if np.signbit(value):
+        neg_ct += 1
+    
+    # Runs of one value average to exactly that value
+    if value == prev:
+        same_count += 1
+    else:
+        same_count = 1.0
+    prev = value
+    
+    return (nobs, neg_ct, total, comp_add, comp_remove, same_count, prev)
+
+
+@njit(cache=True)
+def _window_remove(state, value: float):
+    """Remove a value leaving the mean window (NaN and inf are skipped)"""
+    if not np.isfinite(value):
+        return state
+    nobs, neg_ct, total, comp_add, comp_remove, same_count, prev = state
+    
+    nobs -= 1
+    y = -value - comp_remove
+    t = total + y
+    comp_remove = t - total - y
+    total = t
+    if np.signbit(value):
+        neg_ct -= 1
+    
+    return (nobs, neg_ct, total, comp_add, comp_remove, same_count, prev)
+
+
+@njit(cache=True)
+def _window_mean(state, min_periods: int) -> float:
+    """Current window average, NaN until min_periods values are held"""
+    nobs, neg_ct, total, comp_add, comp_remove, same_count, prev = state
+    if nobs < min_periods or nobs <= 0:
+        return np.nan
+    
+    result = total / nobs
+    if same_count >= nobs:
+        result = prev
+    elif neg_ct == 0 and result < 0:
+        result = 0.0
+    elif neg_ct == nobs and result > 0:
+        result = 0.0
+    return result
+
+
+@njit(cache=True)
+def _var_add(state, value: float):
+    """Add a value entering the variance window (NaN and inf are skipped)"""
+    if not np.isfinite(value):
+        return state
+    nobs, mean, ssqdm, comp_add, comp_remove, unstable = state
+    prev_m2 = ssqdm
+    
+    # Kahan-compensated Welford update
+    nobs += 1
+    prev_mean = mean - comp_add
+    y = value - comp_add
+    t = y - mean
+    comp_add = t + mean - y
+    mean = mean + t / nobs
+    ssqdm = ssqdm + (value - prev_mean) * (value - mean)
+    
+    if prev_m2 * _INV_COND_TOL > ssqdm:
+        unstable = 1.0
+    
+    return (nobs, mean, ssqdm, comp_add, comp_remove, unstable)
+
+
+@njit(cache=True)
+def _var_remove(state, value: float):
+    """Remove a value leaving the variance window (NaN and inf are skipped)"""
+    if not np.isfinite(value):
+        return state
+    nobs, mean, ssqdm, comp_add, comp_remove, unstable = state
+    prev_m2 = ssqdm
+    
+    nobs -= 1
+    if nobs > 0:
+        prev_mean = mean - comp_remove
+        y = value - comp_remove
+        t = y - mean
+        comp_remove = t + mean - y
+        mean = mean - t / nobs
+        ssqdm = ssqdm - (value - prev_mean) * (value - mean)
+        
+        if prev_m2 * _INV_COND_TOL > ssqdm:
+            unstable = 1.0
+    else:
+        mean = 0.0
+        ssqdm = 0.0
+        unstable = 0.0
+    
+    return (nobs, mean, ssqdm, comp_add, comp_remove, unstable)
+
+
+@njit(cache=True)
+def _var_rebuild(x: np.ndarray, start: int, stop: int):
+    """Build a variance window over x[start:stop] from scratch"""
+    state = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+    for j in range(start, stop):
+        state = _var_add(state, x[j])
+    nobs, mean, ssqdm, comp_add, comp_remove, unstable = state
+    return (nobs, mean, ssqdm, comp_add, comp_remove, 0.0)
+
+
+@njit(cache=True)
+def _var_value(state, min_periods: int) -> float:
+    """Current sample variance, NaN until min_periods (and at least 2) values are held"""
+    nobs = state[0]
+    if nobs >= min_periods and nobs > 1:
+        return state[2] / (nobs - 1)
+    return np.nan
+
+
+@njit(cache=True)
+def sma_kernel(x: np.ndarray, period: int) -> np.ndarray:
+    """
+    Simple Moving Average with a running window sum
+    
+    Each bar subtracts the outgoing value and adds the incoming one, so the
+    cost is O(n) regardless of period. The arithmetic mirrors pandas'
+    rolling(period, min_periods=period).mean() (Kahan-compensated sums,
+    repeated-value and sign corrections), so results are identical: NaN
+    until the window holds period finite values (inf counts as missing,
+    as in pandas).
+    
+    Args:
+        x: Input values (float64)
+        period: Number of periods
+        
+    Returns:
+        Array of averages, same length as x
+    """
+    n = x.shape[0]
+    out = np.empty(n)
+    state = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+    
+    for i in range(n):
+        if i == 0 or period == 1:
+            # Window does not overlap the previous one: start over
+            state = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, x[i])
+        elif i >= period:
+            state = _window_remove(state, x[i - period])
+        state = _window_add(state, x[i])
+        out[i] = _window_mean(state, period)
+    
+    return out
+
+
+@njit(cache=True)
+def sma_push(state, ring: np.ndarray, count: int, value: float):
+    """
+    Advance a streaming Simple Moving Average by one value in O(1)
+    
+    The ring holds the last len(ring) values and is updated in place; the
+    result matches sma_kernel over the same sequence.
+    
+    Args:
+        state: Window state returned by the previous call (ignored when
+            count is 0)
+        ring: Ring buffer of length period
+        count: Number of values pushed before this one
+        value: New value
+        
+    Returns:
+        Tuple of (new state, current average)
+    """
+    period = ring.shape[0]
+    slot = count % period
+    
+    if count == 0 or period == 1:
+        state = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, value)
+    elif count >= period:
+        # The slot still holds the value pushed period bars ago
+        state = _window_remove(state, ring[slot])
+    ring[slot] = value
+    state = _window_add(state, value)
+    
+    return state, _window_mean(state, period)
+
+
+@njit(cache=True)
+def _ema_update(state, value: float, com: float):
+    """
+    Advance an EMA state (weighted, old_wt, new_wt, nobs) by one value
+    
+    Mirrors pandas' ewm(adjust=False, ignore_na=False) mean update; inf
+    counts as missing, like NaN.
+    """
+    weighted, old_wt, new_wt, nobs = state
+    is_observation = np.isfinite(value)
+    if is_observation:
+        nobs += 1
+    
+    if not np.isnan(weighted):
+        old_wt *= 1.0 - 1.0 / (1.0 + com)
+        if is_observation:
+            # Constant stretches keep their exact value
+            if weighted != value:
+                if com == 1:
+                    new_wt = 1.0 - old_wt
+                weighted = old_wt * weighted + new_wt * value
+                weighted /= (old_wt + new_wt)
+            old_wt = 1.0
+    elif is_observation:
+        weighted = value
+    
+    return (weighted, old_wt, new_wt, nobs)
+
+
+@njit(cache=True)
+def _ema_init(first: float, com: float):
+    """EMA state seeded with the first value"""
+    if not np.isfinite(first):
+        return (np.nan, 1.0, 1.0 / (1.0 + com), 0.0)
+    return (first, 1.0, 1.0 / (1.0 + com), 1.0)
+
+
+@njit(cache=True)
+def ema_kernel(x: np.ndarray, period: int, min_periods: int) -> np.ndarray:
+    """
+    Exponential Moving Average (span = period, no adjustment) in one pass
+    
+    Follows pandas' ewm(span=period, adjust=False).mean() step for step:
+    seeded with the first value, NaN (or inf) gaps decay the weight of the
+    previous average without resetting it, and output is NaN until
+    min_periods finite values have been seen.
+    
+    Args:
+        x: Input values (float64)
+        period: EMA span
+        min_periods: Minimum number of observations before output
+        
+    Returns:
+        Array of averages, same length as x
+    """
+    n = x.shape[0]
+    out = np.empty(n)
+    com = (period - 1) / 2.0
+    min_periods = max(min_periods, 1)
+    
+    for i in range(n):
+        if i == 0:
+            state = _ema_init(x[0], com)
+        else:
+            state = _ema_update(state, x[i], com)
+        out[i] = state[0] if state[3] >= min_periods else np.nan
+    
+    return out
+
+
+@njit(cache=True)
+def macd_kernel(x: np.ndarray, fast: int, slow: int, signal: int):
+    """
+    MACD line, signal line and histogram in one pass
+    
+    The three EMAs run in the same loop, so their (latency-bound)
+    recurrences overlap instead of running back to back. Each matches
+    ema_kernel with min_periods of 1.
+    
+    Args:
+        x: Price values (float64)
+        fast: Fast EMA span
+        slow: Slow EMA span
+        signal: Signal line EMA span
+        
+    Returns:
+        Tuple of (macd_line, signal_line, histogram) arrays
+    """
+    n = x.shape[0]
+    macd_line = np.empty(n)
+    signal_line = np.empty(n)
+    histogram = np.empty(n)
+    com_fast = (fast - 1) / 2.0
+    com_slow = (slow - 1) / 2.0
+    com_signal = (signal - 1) / 2.0
+    
+    for i in range(n):
+        if i == 0:
+            fast_state = _ema_init(x[0], com_fast)
+            slow_state = _ema_init(x[0], com_slow)
+        else:
+            fast_state = _ema_update(fast_state, x[i], com_fast)
+            slow_state = _ema_update(slow_state, x[i], com_slow)
+        ema_fast = fast_state[0] if fast_state[3] >= 1 else np.nan
+        ema_slow = slow_state[0] if slow_state[3] >= 1 else np.nan
+        line = ema_fast - ema_slow
+        
+        if i == 0:
+            signal_state = _ema_init(line, com_signal)
+        else:
+            signal_state = _ema_update(signal_state, line, com_signal)
+        signal_value = signal_state[0] if signal_state[3] >= 1 else np.nan
+        
+        macd_line[i] = line
+        signal_line[i] = signal_value
+        histogram[i] = line - signal_value
+    
+    return macd_line, signal_line, histogram
+
+
+@njit(cache=True)
+def bb_kernel(x: np.ndarray, period: int, num_std: float):
+    """
+    Bollinger Bands with running mean and variance in one pass
+    
+    The mean matches sma_kernel and the standard deviation agrees to
+    rounding with pandas' rolling(period).std() (sample, ddof=1). It is
+    computed with a compensated Welford update rather than sum of squares,
+    which loses most of its precision on prices far from zero. Windows
+    whose update cancels catastrophically are recomputed from scratch.
+    
+    Args:
+        x: Price values (float64)
+        period: Number of periods
+        num_std: Number of standard deviations
+        
+    Returns:
+        Tuple of (middle_band, upper_band, lower_band) arrays
+    """
+    n = x.shape[0]
+    middle = np.empty(n)
+    upper = np.empty(n)
+    lower = np.empty(n)
+    mean_state = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+    var_state = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+    
+    for i in range(n):
+        if i == 0 or period == 1:
+            mean_state = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, x[i])
+            var_state = _var_rebuild(x, max(0, i - period + 1), i + 1)
+        else:
+            if i >= period:
+                mean_state = _window_remove(mean_state, x[i - period])
+                var_state = _var_remove(var_state, x[i - period])
+            var_state = _var_add(var_state, x[i])
+            if var_state[5]:
+                # Catastrophic cancellation: recompute this window
+                var_state = _var_rebuild(x, max(0, i - period + 1), i + 1)
+        mean_state = _window_add(mean_state, x[i])
+        
+        mean = _window_mean(mean_state, period)
+        var = _var_value(var_state, period)
+        # Tiny negative variances from cancellation count as zero
+        std = np.sqrt(var) if not var < 0 else 0.0
+        middle[i] = mean
+        upper[i] = mean + std * num_std
+        lower[i] = mean - std * num_std
+    
+    return middle, upper, lower
+
+
+@njit(cache=True)
+def crossover_kernel(sma_short: np.ndarray, sma_long: np.ndarray):
+    """
+    Difference of two moving averages and its crossovers in one pass
+    
+    Crossover is 1 where the difference turns positive (from <= 0), -1 where
+    it turns negative (from >= 0) and 0 otherwise; comparisons against NaN
+    are false, as with the equivalent pandas expressions.
+    
+    Args:
+        sma_short: Short moving average
+        sma_long: Long moving average
+        
+    Returns:
+        Tuple of (sma_diff, crossover) arrays
+    """
+    n = sma_short.shape[0]
+    sma_diff = np.empty(n)
+    crossover = np.zeros(n, dtype=np.int8)
+    
+    prev_diff = np.nan
+    for i in range(n):
+        diff = sma_short[i] - sma_long[i]
+        sma_diff[i] = diff
+        
+        if diff > 0 and prev_diff <= 0:
+            crossover[i] = 1
+        elif diff < 0 and prev_diff >= 0:
+            crossover[i] = -1
+        prev_diff = diff
+    
+    return sma_diff, crossover
+
+
+@njit(cache=True, parallel=True)
+def batch_signals_kernel(close: np.ndarray, shorts: np.ndarray, longs: np.ndarray,
+                         confirms: np.ndarray) -> np.ndarray:
+    """
+    SMA crossover signals for many parameter sets at once
+    
+    Parameter sets are spread over all cores; each row is computed exactly
+    like sma_kernel + crossover_kernel + the confirmation step of
+    SMACrossoverStrategy.generate_signals.
+    
+    Args:
+        close: Close prices (float64)
+        shorts: Short MA period of each parameter set
+        longs: Long MA period of each parameter set
+        confirms: Confirmation candles (min_candles_after_cross) of each set
+        
+    Returns:
+        int8 matrix of signals, one row per parameter set
+    """
+    n = close.shape[0]
+    m = shorts.shape[0]
+    out = np.zeros((m, n), dtype=np.int8)
+    
+    for p in prange(m):
+        short_period = shorts[p]
+        long_period = longs[p]
+        k = confirms[p]
+        crossover = np.zeros(n, dtype=np.int8)
+        short_state = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+        long_state = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+        prev_diff = np.nan
+        
+        for i in range(n):
+            value = close[i]
+            if i == 0 or short_period == 1:
+                short_state = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, value)
+            elif i >= short_period:
+                short_state = _window_remove(short_state, close[i - short_period])
+            short_state = _window_add(short_state, value)
+            
+            if i == 0 or long_period == 1:
+                long_state = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, value)
+            elif i >= long_period:
+                long_state = _window_remove(long_state, close[i - long_period])
+            long_state = _window_add(long_state, value)
+            
+            sma_short = _window_mean(short_state, short_period)
+            sma_long = _window_mean(long_state, long_period)
+            diff = sma_short - sma_long
+            
+            if diff > 0 and prev_diff <= 0:
+                crossover[i] = 1
+            elif diff < 0 and prev_diff >= 0:
+                crossover[i] = -1
+            prev_diff = diff
+            
+            if k <= 1:
+                out[p, i] = crossover[i]
+            elif i >= k:
+                # Confirm the crossover from k candles back
+                if crossover[i - k] == 1 and sma_short > sma_long:
+                    out[p, i] = 1
+                elif crossover[i - k] == -1 and sma_short < sma_long:
+                    out[p, i] = -1
+    
+    return out
+
+
+@njit(cache=True)
+def trade_walk_kernel(signal: np.ndarray, close: np.ndarray):
+    """
+    Pair alternating signals into entry/exit trades
+    
+    The first signal opens a position, the next opposite signal closes it
+    and opens the reverse position; repeated same-direction signals are
+    ignored. Trade columns are written straight into arrays preallocated
+    for the largest possible trade count (one per signal).
+    
+    Args:
+        signal: Signal of every bar (1 = buy, -1 = sell, 0 = hold)
+        close: Close price of every bar
+        
+    Returns:
+        Tuple of (entry_idx, exit_idx, direction, entry_price, exit_price,
+        pips_profit, percent_profit) arrays, one element per trade;
+        direction is 1 (long) or -1 (short)
+    """
+    n = signal.shape[0]
+    max_trades = 0
+    for i in range(n):
+        if signal[i] == 1 or signal[i] == -1:
+            max_trades += 1
+    
+    entry_idx = np.empty(max_trades, dtype=np.int64)
+    exit_idx = np.empty(max_trades, dtype=np.int64)
+    direction = np.empty(max_trades, dtype=np.int8)
+    entry_price = np.empty(max_trades)
+    exit_price = np.empty(max_trades)
+    pips_profit = np.empty(max_trades)
+    percent_profit = np.empty(max_trades)
+    
+    k = 0
+    position = 0
+    entry = 0
+    for i in range(n):
+        s = signal[i]
+        if s != 1 and s != -1:
+            continue
+        
+        if position == 0:
+            position = s
+            entry = i
+        elif s == -position:
+            # Exit and reverse
+            opened = close[entry]
+            closed = close[i]
+            # Price move in the trade's favour: positive for a winning trade
+            if position == 1:
+                move = closed - opened
+            else:
+                move = opened - closed
+            
+            entry_idx[k] = entry
+            exit_idx[k] = i
+            direction[k] = position
+            entry_price[k] = opened
+            exit_price[k] = closed
+            pips_profit[k] = move * 10000
+            percent_profit[k] = (move / opened) * 100
+            k += 1
+            
+            position = s
+            entry = i
+    
+    return (entry_idx[:k], exit_idx[:k], direction[:k], entry_price[:k],
+            exit_price[:k], pips_profit[:k], percent_profit[:k])
+
+
+# Pay the JIT compilation cost once, at import time
+sma_kernel(np.zeros(2), 1)
+sma_push((0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0), np.zeros(1), 0, 0.0)
+ema_kernel(np.zeros(2), 2, 1)
+macd_kernel(np.zeros(2), 2, 3, 2)
+bb_kernel(np.zeros(2), 2, 2.0)
+crossover_kernel(np.zeros(2), np.zeros(2))
+trade_walk_kernel(np.zeros(1, dtype=np.int8), np.zeros(1))
@@ -10,6 +10,9 @@ import numpy as np
 from datetime import datetime
 import logging
 
+from ._kernels import bb_kernel, ema_kernel, macd_kernel, sma_kernel
+from ..utils.time_format import format_utc_times
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,6 +37,11 @@ class BaseStrategy(ABC):
         self.parameters = parameters or {}
         self.data = None
         self.signals = None
+        self._t_start = None
+        self._t_end = None
+        # Signal counts, set by generate_signals (or counted on demand)
+        self._n_buy = None
+        self._n_sell = None
         
         logger.info(f"Initialized strategy: {name}")
         if self.parameters:
@@ -43,6 +51,12 @@ class BaseStrategy(ABC):
         """
         Load price data into the strategy
         
+        A frame whose time column is already datetime and sorted is borrowed
+        rather than copied: the strategy works on a shallow copy that shares
+        the caller's column data, so columns it adds never appear on the
+        caller's frame, but the price columns should not be modified in
+        place while the strategy is in use.
+        
         Args:
             data: DataFrame with OHLC data (columns: time, open, high, low, close, volume)
         """
@@ -53,17 +67,36 @@ class BaseStrategy(ABC):
             missing = [col for col in required_columns if col not in data.columns]
             raise ValueError(f"Data missing required columns: {missing}")
         
-        # Make a copy and ensure time is datetime
-        self.data = data.copy()
-        if not pd.api.types.is_datetime64_any_dtype(self.data['time']):
-            self.data['time'] = pd.to_datetime(self.data['time'])
-        
-        # Sort by time
-        self.data = self.data.sort_values('time').reset_index(drop=True)
+        time = data['time']
+        if pd.api.types.is_datetime64_any_dtype(time) and time.is_monotonic_increasing:
+            # Already typed and sorted: borrow the columns instead of copying
+            self.data = data.copy(deep=False)
+        else:
+            # Make a copy and ensure time is datetime
+            self.data = data.copy()
+            if not pd.api.types.is_datetime64_any_dtype(self.data['time']):
+                self.data['time'] = pd.to_datetime(self.data['time'])
+            
+            # Sort by time, unless parsing showed it already is (stable, so
+            # candles with equal times keep their order)
+            if not self.data['time'].is_monotonic_increasing:
+                self.data = self.data.sort_values('time', kind='mergesort')
+        
+        index = self.data.index
+        if not (isinstance(index, pd.RangeIndex) and index.start == 0 and index.step == 1):
+            self.data = self.data.reset_index(drop=True)
+        
+        # Time is sorted now, so its range is just the first and last value
+        # (NaT sort last, so fall back to a scan if there are any)
+        time = self.data['time']
+        if len(time) == 0 or time.hasnans:
+            self._t_start, self._t_end = time.min(), time.max()
+        else:
+            self._t_start, self._t_end = time.iloc[0], time.iloc[-1]
         
         logger.info(
             f"Loaded {len(self.data)} candles "
-            f"from {self.data['time'].min()} to {self.data['time'].max()}"
+            f"from {self._t_start} to {self._t_end}"
         )
     
     @abstractmethod
@@ -106,11 +139,11 @@ class BaseStrategy(ABC):
         self.data = self.calculate_indicators()
         
         # Generate signals
+        self._n_buy = self._n_sell = None
         self.signals = self.generate_signals()
         
         # Count signals
-        buy_signals = (self.signals['signal'] == 1).sum()
-        sell_signals = (self.signals['signal'] == -1).sum()
+        buy_signals, sell_signals = self._signal_counts()
         
         logger.info(
             f"Strategy complete: {buy_signals} buy signals, "
@@ -119,6 +152,28 @@ class BaseStrategy(ABC):
         
         return self.signals
     
+    def _count_signals(self, signal: np.ndarray) -> None:
+        """
+        Record the number of buy and sell signals
+        
+        Args:
+            signal: Signal column values
+        """
+        self._n_buy = int(np.count_nonzero(signal == 1))
+        self._n_sell = int(np.count_nonzero(signal == -1))
+    
+    def _signal_counts(self) -> Tuple[int, int]:
+        """
+        Get the number of buy and sell signals, counting them only if
+        generate_signals did not
+        
+        Returns:
+            Tuple of (buy_signals, sell_signals)
+        """
+        if self._n_buy is None or self._n_sell is None:
+            self._count_signals(self.signals['signal'].to_numpy())
+        return self._n_buy, self._n_sell
+    
     def get_latest_signal(self) -> Dict:
         """
         Get the most recent signal
@@ -169,6 +224,21 @@ class BaseStrategy(ABC):
         else:
             return f"HOLD at {row['close']:.5f} on {row['time']}"
     
+    def _signal_columns(self, rows: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Extra per-signal columns for get_all_signals and export_signals
+        
+        Strategies override this to derive values that are only needed on
+        signal rows, instead of filling them for every bar.
+        
+        Args:
+            rows: Signal rows of self.signals
+            
+        Returns:
+            Dictionary of column name -> values, one per row (empty by default)
+        """
+        return {}
+    
     def get_all_signals(self, signal_type: Optional[int] = None) -> pd.DataFrame:
         """
         Get all signals or filter by type
@@ -177,15 +247,22 @@ class BaseStrategy(ABC):
             signal_type: Filter by signal (1 = buy, -1 = sell, 0 = hold, None = all)
             
         Returns:
-            DataFrame with filtered signals
+            DataFrame with filtered signals and any per-signal columns the
+            strategy derives (see _signal_columns)
         """
         if self.signals is None:
             return pd.DataFrame()
         
         if signal_type is not None:
-            return self.signals[self.signals['signal'] == signal_type].copy()
+            signals = self.signals[self.signals['signal'] == signal_type].copy()
+        else:
+            signals = self.signals[self.signals['signal'] != 0].copy()
         
-        return self.signals[self.signals['signal'] != 0].copy()
+        # The rows are a fresh copy, so extra columns go in without another
+        for name, values in self._signal_columns(signals).items():
+            signals[name] = values
+        
+        return signals
     
     def get_summary(self) -> Dict:
         """
@@ -197,8 +274,7 @@ class BaseStrategy(ABC):
         if self.signals is None:
             return {}
         
-        buy_signals = (self.signals['signal'] == 1).sum()
-        sell_signals = (self.signals['signal'] == -1).sum()
+        buy_signals, sell_signals = self._signal_counts()
         total_signals = buy_signals + sell_signals
         
         return {
@@ -206,8 +282,8 @@ class BaseStrategy(ABC):
             'parameters': self.parameters,
             'data_points': len(self.data) if self.data is not None else 0,
             'date_range': {
-                'start': self.data['time'].min() if self.data is not None else None,
-                'end': self.data['time'].max() if self.data is not None else None
+                'start': self._t_start if self.data is not None else None,
+                'end': self._t_end if self.data is not None else None
             },
             'signals': {
                 'total': total_signals,
@@ -228,9 +304,21 @@ class BaseStrategy(ABC):
         if self.signals is None:
             raise ValueError("No signals to export. Run the strategy first.")
         
-        # Only export rows with actual signals (not holds)
-        signal_data = self.signals[self.signals['signal'] != 0].copy()
-        signal_data.to_csv(filepath, index=False)
+        # Only export rows with actual signals (not holds), with any
+        # per-signal columns the strategy derives for them
+        signal_data = self.signals.loc[self.signals['signal'] != 0]
+        columns = self._signal_columns(signal_data)
+        
+        # pandas formats tz-aware times one Timestamp at a time; render whole
+        # second UTC times in bulk instead, with the same text
+        times = format_utc_times(signal_data['time'])
+        if times is not None:
+            columns['time'] = times
+        
+        if columns:
+            signal_data = signal_data.assign(**columns)
+        
+        signal_data.to_csv(filepath, index=False, chunksize=65536)
         
         logger.info(f"Exported {len(signal_data)} signals to {filepath}")
     
@@ -239,6 +327,18 @@ class BaseStrategy(ABC):
         return f"{self.__class__.__name__}(name='{self.name}', parameters={self.parameters})"
 
 
+def _check_period(period: int, name: str = 'Period') -> None:
+    """
+    Reject window lengths below 1, which the kernels cannot handle
+    
+    Args:
+        period: Window length or span
+        name: Parameter name for the error message
+    """
+    if period < 1:
+        raise ValueError(f"{name} ({period}) must be at least 1")
+
+
 class TechnicalIndicators:
     """
     Collection of common technical indicators
@@ -257,7 +357,12 @@ class TechnicalIndicators:
         Returns:
             SMA series
         """
-        return data.rolling(window=period, min_periods=period).mean()
+        _check_period(period)
+        return pd.Series(
+            sma_kernel(data.to_numpy(dtype=np.float64), period),
+            index=data.index,
+            name=data.name
+        )
     
     @staticmethod
     def ema(data: pd.Series, period: int) -> pd.Series:
@@ -271,7 +376,12 @@ class TechnicalIndicators:
         Returns:
             EMA series
         """
-        return data.ewm(span=period, adjust=False, min_periods=period).mean()
+        _check_period(period)
+        return pd.Series(
+            ema_kernel(data.to_numpy(dtype=np.float64), period, period),
+            index=data.index,
+            name=data.name
+        )
     
     @staticmethod
     def rsi(data: pd.Series, period: int = 14) -> pd.Series:
@@ -285,12 +395,20 @@ class TechnicalIndicators:
         Returns:
             RSI series
         """
-        delta = data.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+        _check_period(period)
+        values = data.to_numpy(dtype=np.float64)
+        delta = np.empty_like(values)
+        delta[:1] = np.nan
+        with np.errstate(invalid='ignore'):
+            np.subtract(values[1:], values[:-1], out=delta[1:])
+        
+        # fmax/fmin treat the leading NaN as no move, like where(..., 0)
+        gain = sma_kernel(np.fmax(delta, 0.0), period)
+        loss = sma_kernel(-np.fmin(delta, 0.0), period)
         
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = gain / loss
+            rsi = pd.Series(100 - (100 / (1 + rs)), index=data.index, name=data.name)
         
         return rsi
     
@@ -308,12 +426,17 @@ class TechnicalIndicators:
         Returns:
             ATR series
         """
-        high_low = high - low
-        high_close = np.abs(high - close.shift())
-        low_close = np.abs(low - close.shift())
+        _check_period(period)
+        h = high.to_numpy(dtype=np.float64)
+        l = low.to_numpy(dtype=np.float64)
+        prev_close = np.empty_like(h)
+        prev_close[:1] = np.nan
+        prev_close[1:] = close.to_numpy(dtype=np.float64)[:-1]
         
-        true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-        atr = true_range.rolling(window=period, min_periods=period).mean()
+        # fmax skips NaN like DataFrame.max, so the first bar's range is high - low
+        with np.errstate(invalid='ignore'):
+            true_range = np.fmax.reduce([h - l, np.abs(h - prev_close), np.abs(l - prev_close)])
+        atr = pd.Series(sma_kernel(true_range, period), index=high.index)
         
         return atr
     
@@ -330,11 +453,12 @@ class TechnicalIndicators:
         Returns:
             Tuple of (middle_band, upper_band, lower_band)
         """
-        middle_band = data.rolling(window=period, min_periods=period).mean()
-        std = data.rolling(window=period, min_periods=period).std()
+        _check_period(period)
+        middle, upper, lower = bb_kernel(data.to_numpy(dtype=np.float64), period, num_std)
         
-        upper_band = middle_band + (std * num_std)
-        lower_band = middle_band - (std * num_std)
+        middle_band = pd.Series(middle, index=data.index, name=data.name)
+        upper_band = pd.Series(upper, index=data.index, name=data.name)
+        lower_band = pd.Series(lower, index=data.index, name=data.name)
         
         return middle_band, upper_band, lower_band
     
@@ -352,11 +476,15 @@ class TechnicalIndicators:
         Returns:
             Tuple of (macd_line, signal_line, histogram)
         """
-        ema_fast = data.ewm(span=fast, adjust=False).mean()
-        ema_slow = data.ewm(span=slow, adjust=False).mean()
-        
-        macd_line = ema_fast - ema_slow
-        signal_line = macd_line.ewm(span=signal, adjust=False).mean()
-        histogram = macd_line - signal_line
+        _check_period(fast, 'Fast period')
+        _check_period(slow, 'Slow period')
+        _check_period(signal, 'Signal period')
+        macd_line, signal_line, histogram = macd_kernel(
+            data.to_numpy(dtype=np.float64), fast, slow, signal
+        )
         
-        return macd_line, signal_line, histogram
\ No newline at end of file
+        return (
+            pd.Series(macd_line, index=data.index, name=data.name),
+            pd.Series(signal_line, index=data.index, name=data.name),
+            pd.Series(histogram, index=data.index, name=data.name)
+        )
\ No newline at end of file
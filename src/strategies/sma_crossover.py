@@ -9,9 +9,11 @@ A simple trend-following strategy based on moving average crossovers:
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Optional
+from typing import Dict, Optional, Sequence, Tuple, Union
 
-from .base_strategy import BaseStrategy, TechnicalIndicators
+from .base_strategy import BaseStrategy
+from ._cache import content_key, sma_cached
+from ._kernels import batch_signals_kernel, crossover_kernel, sma_push, trade_walk_kernel
 
 logger = logging.getLogger(__name__)
 
@@ -53,11 +55,15 @@ class SMACrossoverStrategy(BaseStrategy):
         self.min_candles_after_cross = min_candles_after_cross
         
         # Validate parameters
+        if short_period < 1:
+            raise ValueError(f"Short period ({short_period}) must be at least 1")
         if short_period >= long_period:
             raise ValueError(
                 f"Short period ({short_period}) must be less than "
                 f"long period ({long_period})"
             )
+        
+        self.reset_stream()
     
     def calculate_indicators(self) -> pd.DataFrame:
         """
@@ -68,37 +74,24 @@ class SMACrossoverStrategy(BaseStrategy):
         """
         logger.info("Calculating SMA indicators...")
         
-        # Calculate short and long SMAs
-        self.data['sma_short'] = TechnicalIndicators.sma(
-            self.data['close'],
-            self.short_period
-        )
-        
-        self.data['sma_long'] = TechnicalIndicators.sma(
-            self.data['close'],
-            self.long_period
-        )
-        
-        # Calculate the difference (for identifying crossovers)
-        self.data['sma_diff'] = self.data['sma_short'] - self.data['sma_long']
-        
-        # Identify crossover points
-        # Crossover = when diff changes sign
-        self.data['crossover'] = 0
-        
-        # Golden cross: short MA crosses above long MA (bullish)
-        self.data.loc[
-            (self.data['sma_diff'] > 0) & 
-            (self.data['sma_diff'].shift(1) <= 0),
-            'crossover'
-        ] = 1
-        
-        # Death cross: short MA crosses below long MA (bearish)
-        self.data.loc[
-            (self.data['sma_diff'] < 0) & 
-            (self.data['sma_diff'].shift(1) >= 0),
-            'crossover'
-        ] = -1
+        # SMAs are memoized, so runs over the same prices (e.g. a parameter
+        # sweep) share any period they have in common
+        close = self.data['close'].to_numpy(dtype=np.float64)
+        key = content_key(close)
+        sma_short = sma_cached(close, self.short_period, key)
+        sma_long = sma_cached(close, self.long_period, key)
+        
+        # Difference and crossover points in one pass.
+        # Golden cross = 1 (short MA crosses above long MA, bullish),
+        # death cross = -1 (short MA crosses below long MA, bearish)
+        sma_diff, crossover = crossover_kernel(sma_short, sma_long)
+        
+        # Plain column setitem adds the new arrays without copying the
+        # price columns (assign() would copy the whole frame)
+        self.data['sma_short'] = sma_short
+        self.data['sma_long'] = sma_long
+        self.data['sma_diff'] = sma_diff
+        self.data['crossover'] = crossover
         
         logger.info(
             f"Calculated SMAs: {self.short_period}-period and {self.long_period}-period"
@@ -115,46 +108,140 @@ class SMACrossoverStrategy(BaseStrategy):
         """
         logger.info("Generating trading signals...")
         
-        # Initialize signal column
-        self.data['signal'] = 0
-        
         # Generate signals at crossover points
         # We can add confirmation by waiting min_candles_after_cross
         if self.min_candles_after_cross > 1:
-            # Wait for confirmation
-            for i in range(len(self.data)):
-                if self.data.loc[i, 'crossover'] != 0:
-                    # Check if we have enough future candles
-                    if i + self.min_candles_after_cross < len(self.data):
-                        # Confirm the crossover is still valid
-                        future_idx = i + self.min_candles_after_cross
-                        
-                        if self.data.loc[i, 'crossover'] == 1:
-                            # Golden cross - confirm short still above long
-                            if self.data.loc[future_idx, 'sma_short'] > self.data.loc[future_idx, 'sma_long']:
-                                self.data.loc[future_idx, 'signal'] = 1
-                        
-                        elif self.data.loc[i, 'crossover'] == -1:
-                            # Death cross - confirm short still below long
-                            if self.data.loc[future_idx, 'sma_short'] < self.data.loc[future_idx, 'sma_long']:
-                                self.data.loc[future_idx, 'signal'] = -1
+            # Wait for confirmation: a crossover k candles back becomes a
+            # signal if the MAs are still on the same side now
+            k = self.min_candles_after_cross
+            crossover = self.data['crossover'].to_numpy()
+            sma_short = self.data['sma_short'].to_numpy()
+            sma_long = self.data['sma_long'].to_numpy()
+            
+            cross_shift = np.zeros_like(crossover)
+            cross_shift[k:] = crossover[:-k]
+            
+            self.data['signal'] = np.where(
+                (cross_shift == 1) & (sma_short > sma_long), np.int8(1),
+                np.where((cross_shift == -1) & (sma_short < sma_long), np.int8(-1), np.int8(0))
+            )
         else:
             # No confirmation needed, use crossover directly
             self.data['signal'] = self.data['crossover']
         
-        # Add signal strength (distance between MAs as percentage)
-        self.data['signal_strength'] = (
-            abs(self.data['sma_diff']) / self.data['close'] * 100
-        )
-        
         # Count valid signals (non-zero)
-        buy_signals = (self.data['signal'] == 1).sum()
-        sell_signals = (self.data['signal'] == -1).sum()
+        self._count_signals(self.data['signal'].to_numpy())
         
-        logger.info(f"Generated {buy_signals} BUY and {sell_signals} SELL signals")
+        logger.info(f"Generated {self._n_buy} BUY and {self._n_sell} SELL signals")
         
         return self.data
     
+    @staticmethod
+    def _signal_strength(rows: pd.DataFrame) -> np.ndarray:
+        """
+        Signal strength: distance between the MAs as a percentage of price
+        
+        Args:
+            rows: DataFrame rows with sma_diff and close columns
+            
+        Returns:
+            Array of strengths, one per row
+        """
+        return np.abs(rows['sma_diff'].to_numpy()) / rows['close'].to_numpy() * 100
+    
+    @property
+    def signal_strength(self) -> np.ndarray:
+        """
+        Signal strength of each signal bar (signal != 0), in time order
+        
+        Only computed for signal bars, which are a small fraction of the data.
+        """
+        if self.signals is None:
+            return np.empty(0)
+        
+        return self._signal_strength(self.signals[self.signals['signal'] != 0])
+    
+    def _signal_columns(self, rows: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Signal strength of the given signal rows
+        
+        Args:
+            rows: Signal rows of self.signals
+            
+        Returns:
+            Dictionary with a signal_strength column, empty if the rows have
+            no sma_diff column
+        """
+        if 'sma_diff' not in rows.columns:
+            return {}
+        
+        return {'signal_strength': self._signal_strength(rows)}
+    
+    def reset_stream(self) -> None:
+        """
+        Clear the state used by push()
+        """
+        empty = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+        self._stream_count = 0
+        self._ring_short = np.empty(self.short_period)
+        self._ring_long = np.empty(self.long_period)
+        self._state_short = empty
+        self._state_long = empty
+        self._prev_diff = np.nan
+        # Crossovers of the last min_candles_after_cross bars, for confirmation
+        self._ring_cross = np.zeros(max(self.min_candles_after_cross, 1), dtype=np.int8)
+    
+    def push(self, close_px: float) -> int:
+        """
+        Feed one new close price and get its signal immediately
+        
+        Streaming counterpart of run() for live feeds: each call updates two
+        ring buffers and running sums in O(1) with bounded memory, instead of
+        recomputing indicators over the whole history. Pushing a price series
+        bar by bar yields the same signals as run() over that series.
+        
+        Args:
+            close_px: Close price of the new candle
+        
+        Returns:
+            Signal for the candle (1 = buy, -1 = sell, 0 = hold)
+        """
+        count = self._stream_count
+        close_px = float(close_px)
+        
+        self._state_short, sma_short = sma_push(
+            self._state_short, self._ring_short, count, close_px
+        )
+        self._state_long, sma_long = sma_push(
+            self._state_long, self._ring_long, count, close_px
+        )
+        
+        diff = sma_short - sma_long
+        prev_diff = self._prev_diff
+        if diff > 0 and prev_diff <= 0:
+            crossover = 1
+        elif diff < 0 and prev_diff >= 0:
+            crossover = -1
+        else:
+            crossover = 0
+        self._prev_diff = diff
+        self._stream_count = count + 1
+        
+        k = self.min_candles_after_cross
+        if k <= 1:
+            return crossover
+        
+        # Confirm the crossover from k candles back against the MAs now
+        slot = count % k
+        past_crossover = self._ring_cross[slot] if count >= k else 0
+        self._ring_cross[slot] = crossover
+        
+        if past_crossover == 1 and sma_short > sma_long:
+            return 1
+        if past_crossover == -1 and sma_short < sma_long:
+            return -1
+        return 0
+    
     def get_entry_exit_pairs(self) -> pd.DataFrame:
         """
         Match entry signals with their corresponding exit signals
@@ -162,74 +249,31 @@ class SMACrossoverStrategy(BaseStrategy):
         Returns:
             DataFrame with entry/exit pairs and potential profit
         """
-        signals = self.data[self.data['signal'] != 0].copy()
+        (entry_idx, exit_idx, direction, entry_price, exit_price,
+         pips_profit, percent_profit) = trade_walk_kernel(
+            self.data['signal'].to_numpy(),
+            self.data['close'].to_numpy(dtype=np.float64)
+        )
         
-        if len(signals) == 0:
+        if len(entry_idx) == 0:
             return pd.DataFrame()
         
-        trades = []
-        position = None
-        entry_price = None
-        entry_time = None
-        entry_idx = None
-        
-        for idx, row in signals.iterrows():
-            if position is None:
-                # No open position - any signal can be an entry
-                if row['signal'] == 1:
-                    position = 'long'
-                    entry_price = row['close']
-                    entry_time = row['time']
-                    entry_idx = idx
-                elif row['signal'] == -1:
-                    position = 'short'
-                    entry_price = row['close']
-                    entry_time = row['time']
-                    entry_idx = idx
-            
-            else:
-                # Have open position - check for exit
-                if position == 'long' and row['signal'] == -1:
-                    # Exit long position
-                    pips_profit = (row['close'] - entry_price) * 10000
-                    trades.append({
-                        'entry_time': entry_time,
-                        'entry_price': entry_price,
-                        'exit_time': row['time'],
-                        'exit_price': row['close'],
-                        'position_type': 'long',
-                        'pips_profit': pips_profit,
-                        'percent_profit': ((row['close'] - entry_price) / entry_price) * 100
-                    })
-                    position = 'short'  # Reverse position
-                    entry_price = row['close']
-                    entry_time = row['time']
-                    entry_idx = idx
-                
-                elif position == 'short' and row['signal'] == 1:
-                    # Exit short position
-                    pips_profit = (entry_price - row['close']) * 10000
-                    trades.append({
-                        'entry_time': entry_time,
-                        'entry_price': entry_price,
-                        'exit_time': row['time'],
-                        'exit_price': row['close'],
-                        'position_type': 'short',
-                        'pips_profit': pips_profit,
-                        'percent_profit': ((entry_price - row['close']) / entry_price) * 100
-                    })
-                    position = 'long'  # Reverse position
-                    entry_price = row['close']
-                    entry_time = row['time']
-                    entry_idx = idx
-        
-        trades_df = pd.DataFrame(trades)
-        
-        if len(trades_df) > 0:
-            logger.info(
-                f"Found {len(trades_df)} complete trades. "
-                f"Total pips: {trades_df['pips_profit'].sum():.1f}"
-            )
+        time = self.data['time'].array
+        
+        trades_df = pd.DataFrame({
+            'entry_time': time[entry_idx],
+            'entry_price': entry_price,
+            'exit_time': time[exit_idx],
+            'exit_price': exit_price,
+            'position_type': np.where(direction == 1, 'long', 'short'),
+            'pips_profit': pips_profit,
+            'percent_profit': percent_profit
+        })
+        
+        logger.info(
+            f"Found {len(trades_df)} complete trades. "
+            f"Total pips: {trades_df['pips_profit'].sum():.1f}"
+        )
         
         return trades_df
     
@@ -248,23 +292,29 @@ class SMACrossoverStrategy(BaseStrategy):
                 'message': 'No complete trades found'
             }
         
-        winning_trades = trades[trades['pips_profit'] > 0]
-        losing_trades = trades[trades['pips_profit'] < 0]
+        pips = trades['pips_profit'].to_numpy()
+        wins = pips[pips > 0]
+        losses = pips[pips < 0]
+        
+        n_trades = len(pips)
+        n_wins = len(wins)
+        n_losses = len(losses)
+        loss_total = losses.sum() if n_losses > 0 else 0
         
         return {
-            'total_trades': len(trades),
-            'winning_trades': len(winning_trades),
-            'losing_trades': len(losing_trades),
-            'win_rate': len(winning_trades) / len(trades) * 100 if len(trades) > 0 else 0,
-            'total_pips': trades['pips_profit'].sum(),
-            'average_pips_per_trade': trades['pips_profit'].mean(),
-            'best_trade_pips': trades['pips_profit'].max(),
-            'worst_trade_pips': trades['pips_profit'].min(),
-            'average_win_pips': winning_trades['pips_profit'].mean() if len(winning_trades) > 0 else 0,
-            'average_loss_pips': losing_trades['pips_profit'].mean() if len(losing_trades) > 0 else 0,
-            'profit_factor': abs(winning_trades['pips_profit'].sum() / losing_trades['pips_profit'].sum()) 
-                           if len(losing_trades) > 0 and losing_trades['pips_profit'].sum() != 0 else float('inf'),
-            'total_return_percent': trades['percent_profit'].sum()
+            'total_trades': n_trades,
+            'winning_trades': n_wins,
+            'losing_trades': n_losses,
+            'win_rate': n_wins / n_trades * 100 if n_trades > 0 else 0,
+            'total_pips': pips.sum(),
+            'average_pips_per_trade': pips.mean(),
+            'best_trade_pips': pips.max(),
+            'worst_trade_pips': pips.min(),
+            'average_win_pips': wins.mean() if n_wins > 0 else 0,
+            'average_loss_pips': losses.mean() if n_losses > 0 else 0,
+            'profit_factor': abs(wins.sum() / loss_total)
+                           if n_losses > 0 and loss_total != 0 else float('inf'),
+            'total_return_percent': trades['percent_profit'].to_numpy().sum()
         }
     
     def _format_signal_message(self, row: pd.Series) -> str:
@@ -273,7 +323,7 @@ class SMACrossoverStrategy(BaseStrategy):
         
         Args:
             row: DataFrame row
-            
+        
         Returns:
             Formatted message
         """
@@ -292,4 +342,56 @@ class SMACrossoverStrategy(BaseStrategy):
                 f"SMA{self.long_period}={row['sma_long']:.5f} at price {row['close']:.5f}"
             )
         else:
-            return f"No signal at {row['close']:.5f}"
\ No newline at end of file
+            return f"No signal at {row['close']:.5f}"
+
+
+def batch_backtest(
+    close: Union[pd.Series, np.ndarray],
+    params_list: Sequence[Tuple[int, ...]]
+) -> np.ndarray:
+    """
+    Generate SMA crossover signals for many parameter sets in parallel
+    
+    Entry point for parameter sweeps: instead of running one strategy per
+    parameter set in turn, all sets are evaluated in one compiled call
+    spread over the available cores.
+    
+    Args:
+        close: Close prices in time order
+        params_list: (short_period, long_period) or
+            (short_period, long_period, min_candles_after_cross) tuples
+            
+    Returns:
+        int8 signal matrix of shape (len(params_list), len(close)); row i
+        equals the signal column of SMACrossoverStrategy(*params_list[i])
+        run over the same prices
+    
+    Raises:
+        ValueError: If a short period is below 1 or not less than its long
+            period
+    """
+    shorts, longs, confirms = [], [], []
+    for params in params_list:
+        short_period, long_period = params[0], params[1]
+        min_candles_after_cross = params[2] if len(params) > 2 else 1
+        
+        if short_period < 1:
+            raise ValueError(f"Short period ({short_period}) must be at least 1")
+        if short_period >= long_period:
+            raise ValueError(
+                f"Short period ({short_period}) must be less than "
+                f"long period ({long_period})"
+            )
+        
+        shorts.append(short_period)
+        longs.append(long_period)
+        confirms.append(min_candles_after_cross)
+    
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    
+    return batch_signals_kernel(
+        close,
+        np.array(shorts, dtype=np.int64),
+        np.array(longs, dtype=np.int64),
+        np.array(confirms, dtype=np.int64)
+    )
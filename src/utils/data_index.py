@@ -0,0 +1,95 @@
+"""
+Historical Data Index
+Sidecar index mapping each instrument to its most recently saved data file,
+so the latest file can be found without scanning the data directory
+"""
+
+import os
+import json
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+INDEX_FILENAME = '.index.json'
+
+
+def read_index(data_dir: Path) -> dict:
+    """
+    Read the data index of a directory
+    
+    Args:
+        data_dir: Directory holding the data files
+    
+    Returns:
+        Dictionary of instrument -> {'file': filename, 'mtime': mtime},
+        empty if there is no readable index
+    """
+    try:
+        with open(data_dir / INDEX_FILENAME) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    
+    # Anything but an object (e.g. a hand-edited or truncated file) counts
+    # as no index
+    return index if isinstance(index, dict) else {}
+
+
+def update_index(data_dir: Path, instrument: str, filepath: Path) -> None:
+    """
+    Record filepath as the latest data file for an instrument
+    
+    The index is rewritten atomically (temporary file + rename), so readers
+    never see a partially written index.
+    
+    Args:
+        data_dir: Directory holding the data files
+        instrument: Currency pair
+        filepath: Newly saved data file inside data_dir
+    """
+    index = read_index(data_dir)
+    index[instrument] = {
+        'file': filepath.name,
+        'mtime': filepath.stat().st_mtime
+    }
+    
+    fd, tmp_path = tempfile.mkstemp(dir=data_dir, prefix=INDEX_FILENAME, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_path, data_dir / INDEX_FILENAME)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def lookup_index(data_dir: Path, instrument: str) -> Optional[Path]:
+    """
+    Look up the latest data file for an instrument
+    
+    Args:
+        data_dir: Directory holding the data files
+        instrument: Currency pair
+    
+    Returns:
+        Path to the indexed file, or None if the instrument is not indexed,
+        its entry is malformed, or the file was removed or modified since it
+        was recorded
+    """
+    entry = read_index(data_dir).get(instrument)
+    if not isinstance(entry, dict):
+        return None
+    
+    filename, mtime = entry.get('file'), entry.get('mtime')
+    if (not isinstance(filename, str) or not filename
+            or not isinstance(mtime, (int, float)) or isinstance(mtime, bool)):
+        return None
+    
+    filepath = data_dir / filename
+    try:
+        if filepath.stat().st_mtime != mtime:
+            return None
+    except OSError:
+        return None
+    
+    return filepath
@@ -0,0 +1,40 @@
+"""
+Time Formatting
+Bulk rendering of candle times as the text pandas writes for them in CSVs
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+def format_utc_times(time: pd.Series) -> Optional[np.ndarray]:
+    """
+    Render UTC times as the text pandas' to_csv writes for them
+    
+    pandas formats tz-aware times one Timestamp at a time; this renders the
+    whole column with a few vectorized numpy calls instead.
+    
+    Args:
+        time: Time column
+    
+    Returns:
+        Array of strings such as '2024-01-01 00:00:00+00:00', or None if the
+        column is empty or not all whole-second UTC times (NaT included);
+        those are left to pandas to format
+    """
+    if not isinstance(time.dtype, pd.DatetimeTZDtype) or str(time.dt.tz) != 'UTC':
+        return None
+    if len(time) == 0 or time.hasnans:
+        return None
+    
+    naive = time.dt.tz_convert(None).to_numpy()
+    seconds = naive.astype('datetime64[s]')
+    if (seconds != naive).any():
+        return None
+    
+    return np.char.add(
+        np.char.replace(np.datetime_as_string(seconds), 'T', ' '),
+        '+00:00'
+    )
@@ -0,0 +1,30 @@
+"""
+Shared test helpers
+"""
+
+from typing import Optional
+
+import numpy as np
+
+
+def random_walk(
+    n: int,
+    seed: int = 0,
+    scale: float = 0.001,
+    decimals: Optional[int] = None
+) -> np.ndarray:
+    """
+    Build a seeded random-walk price series around 1.1
+
+    Args:
+        n: Number of prices
+        seed: Random seed
+        scale: Standard deviation of each step
+        decimals: Round the prices to this many decimals (None = no rounding)
+
+    Returns:
+        float64 array of prices
+    """
+    rng = np.random.default_rng(seed)
+    prices = 1.1 + np.cumsum(rng.normal(0, scale, n))
+    return prices if decimals is None else np.round(prices, decimals)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Check the SMA memo cache: hits, LRU eviction, byte limit and clearing
+"""
+
+import sys
+import os
+
+import numpy as np
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.strategies import _cache
+from src.strategies._cache import clear_sma_cache, content_key, sma_cached
+from src.strategies._kernels import sma_kernel
+
+from conftest import random_walk
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    """Start and finish every test with an empty cache"""
+    clear_sma_cache()
+    yield
+    clear_sma_cache()
+
+
+def cached_bytes() -> int:
+    """Total size of the cached arrays"""
+    return sum(array.nbytes for array in _cache._sma_cache.values())
+
+
+def test_hit_returns_cached_array():
+    x = random_walk(1000)
+    first = sma_cached(x, 20)
+
+    np.testing.assert_array_equal(first, sma_kernel(x, 20))
+    assert not first.flags.writeable
+    # Same contents (even in a different array) and period: same object
+    assert sma_cached(x.copy(), 20) is first
+    assert sma_cached(x, 20, content_key(x)) is first
+    # Different period or contents: computed separately
+    assert sma_cached(x, 21) is not first
+    assert sma_cached(random_walk(1000, seed=1), 20) is not first
+
+
+def test_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(_cache, 'SMA_CACHE_SIZE', 3)
+    x = random_walk(1000)
+    key = content_key(x)
+
+    hot = sma_cached(x, 2, key)
+    cold = sma_cached(x, 3, key)
+    sma_cached(x, 4, key)
+    sma_cached(x, 2, key)
+    sma_cached(x, 5, key)
+
+    assert len(_cache._sma_cache) == 3
+    assert sma_cached(x, 2, key) is hot
+    assert (key, 3) not in _cache._sma_cache
+    assert sma_cached(x, 3, key) is not cold
+
+
+def test_second_sweep_gets_hits(monkeypatch):
+    computed = []
+
+    def counting_kernel(x, period):
+        computed.append(period)
+        return sma_kernel(x, period)
+
+    monkeypatch.setattr(_cache, 'sma_kernel', counting_kernel)
+    shorts, longs = (2, 3, 4), range(10, 38)
+
+    def sweep(x):
+        """Grid sweep the way a parameter search runs strategies"""
+        computed.clear()
+        key = content_key(x)
+        for short in shorts:
+            for long in longs:
+                sma_cached(x, short, key)
+                sma_cached(x, long, key)
+        return len(computed)
+
+    # Entries heavily used by the first series must not crowd out the
+    # second: each distinct period is computed once per series
+    assert sweep(random_walk(1000, seed=0)) == len(shorts) + len(longs)
+    assert sweep(random_walk(1000, seed=1)) == len(shorts) + len(longs)
+
+
+def test_byte_limit(monkeypatch):
+    x = random_walk(1000)
+    monkeypatch.setattr(_cache, 'SMA_CACHE_BYTES', 2 * x.nbytes)
+    key = content_key(x)
+
+    for period in range(2, 8):
+        sma_cached(x, period, key)
+        assert _cache._sma_cache_bytes == cached_bytes() <= 2 * x.nbytes
+
+    assert len(_cache._sma_cache) == 2
+
+
+def test_oversize_arrays_bypass_cache(monkeypatch):
+    x = random_walk(1000)
+    monkeypatch.setattr(_cache, 'SMA_CACHE_BYTES', x.nbytes - 1)
+
+    result = sma_cached(x, 20)
+
+    np.testing.assert_array_equal(result, sma_kernel(x, 20))
+    assert not result.flags.writeable
+    assert len(_cache._sma_cache) == 0
+    assert _cache._sma_cache_bytes == 0
+
+
+def test_clear_resets_bytes():
+    x = random_walk(1000)
+    for period in (5, 10):
+        sma_cached(x, period)
+    assert _cache._sma_cache_bytes == 2 * x.nbytes
+
+    clear_sma_cache()
+
+    assert len(_cache._sma_cache) == 0
+    assert _cache._sma_cache_bytes == 0
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Check the sidecar index of the latest data file per instrument, and the
+directory scan used when there is no usable index
+"""
+
+import sys
+import os
+import json
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from src.utils.data_index import INDEX_FILENAME, lookup_index, read_index, update_index
+from test_strategy import find_latest_data_file
+
+
+def write_file(path, text='time,open,high,low,close,volume\n', mtime=None):
+    """Create a data file, optionally with a given mtime, and return its path"""
+    path.write_text(text)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_update_then_lookup(tmp_path):
+    first = write_file(tmp_path / 'EUR_USD_H1_20240101.csv')
+    update_index(tmp_path, 'EUR_USD', first)
+    assert lookup_index(tmp_path, 'EUR_USD') == first
+
+    # A newer file replaces the entry; other instruments are kept
+    other = write_file(tmp_path / 'GBP_USD_H1_20240101.csv')
+    update_index(tmp_path, 'GBP_USD', other)
+    second = write_file(tmp_path / 'EUR_USD_H1_20240102.parquet')
+    update_index(tmp_path, 'EUR_USD', second)
+
+    assert lookup_index(tmp_path, 'EUR_USD') == second
+    assert lookup_index(tmp_path, 'GBP_USD') == other
+    assert set(read_index(tmp_path)) == {'EUR_USD', 'GBP_USD'}
+    # Written atomically: no temporary files are left behind
+    assert sorted(p.name for p in tmp_path.iterdir() if p.name.startswith(INDEX_FILENAME)) == [INDEX_FILENAME]
+
+
+def test_missing_index_or_instrument(tmp_path):
+    assert read_index(tmp_path) == {}
+    assert lookup_index(tmp_path, 'EUR_USD') is None
+
+    update_index(tmp_path, 'EUR_USD', write_file(tmp_path / 'EUR_USD_H1.csv'))
+    assert lookup_index(tmp_path, 'USD_JPY') is None
+
+
+def test_stale_mtime(tmp_path):
+    path = write_file(tmp_path / 'EUR_USD_H1.csv')
+    update_index(tmp_path, 'EUR_USD', path)
+
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+    assert lookup_index(tmp_path, 'EUR_USD') is None
+
+
+def test_removed_file(tmp_path):
+    path = write_file(tmp_path / 'EUR_USD_H1.csv')
+    update_index(tmp_path, 'EUR_USD', path)
+    path.unlink()
+
+    assert lookup_index(tmp_path, 'EUR_USD') is None
+
+
+@pytest.mark.parametrize('content', [
+    '{"EUR_USD": {"file": "EUR_USD_H1.c',
+    '["EUR_USD_H1.csv"]',
+    '"EUR_USD_H1.csv"',
+    '{"EUR_USD": "EUR_USD_H1.csv"}',
+    '{"EUR_USD": {"mtime": 1.0}}',
+    '{"EUR_USD": {"file": "EUR_USD_H1.csv"}}',
+    '{"EUR_USD": {"file": 5, "mtime": 1.0}}',
+    '{"EUR_USD": {"file": "EUR_USD_H1.csv", "mtime": "yesterday"}}',
+])
+def test_malformed_index_falls_back(tmp_path, content):
+    path = write_file(tmp_path / 'EUR_USD_H1.csv')
+    (tmp_path / INDEX_FILENAME).write_text(content)
+
+    assert lookup_index(tmp_path, 'EUR_USD') is None
+
+    # A malformed index is replaced by the next update
+    update_index(tmp_path, 'EUR_USD', path)
+    assert lookup_index(tmp_path, 'EUR_USD') == path
+    assert isinstance(json.loads((tmp_path / INDEX_FILENAME).read_text()), dict)
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Empty data/historical directory, without an index, in a scratch cwd"""
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / 'data' / 'historical'
+    path.mkdir(parents=True)
+    return path
+
+
+def test_scan_prefers_newer_csv_over_old_parquet(data_dir):
+    write_file(data_dir / 'EUR_USD_H1_20240101.parquet', mtime=1_700_000_000)
+    write_file(data_dir / 'EUR_USD_H1_20240101.csv', mtime=1_700_000_000)
+    write_file(data_dir / 'EUR_USD_H1_20240301.csv', mtime=1_710_000_000)
+
+    assert find_latest_data_file('EUR_USD').name == 'EUR_USD_H1_20240301.csv'
+
+
+def test_scan_uses_parquet_snapshot_of_newest_csv(data_dir):
+    write_file(data_dir / 'EUR_USD_H1_20240101.csv', mtime=1_700_000_000)
+    write_file(data_dir / 'EUR_USD_H1_20240301.parquet', mtime=1_710_000_000)
+    write_file(data_dir / 'EUR_USD_H1_20240301.csv', mtime=1_710_000_001)
+    write_file(data_dir / 'GBP_USD_H1_20240401.csv', mtime=1_720_000_000)
+
+    assert find_latest_data_file('EUR_USD').name == 'EUR_USD_H1_20240301.parquet'
+
+
+def test_scan_without_files(data_dir):
+    write_file(data_dir / 'GBP_USD_H1_20240101.csv')
+
+    with pytest.raises(FileNotFoundError):
+        find_latest_data_file('EUR_USD')
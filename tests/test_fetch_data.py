@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Check the request windows used to fetch long candle histories, and the
+frame fetch_historical_data builds from them
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import fetch_data
+from fetch_data import GRANULARITY_SECONDS, _granularity_seconds, _request_windows
+from src.api.oanda_client import CANDLE_COLUMNS, OandaClient
+
+
+@pytest.mark.parametrize('granularity', sorted(GRANULARITY_SECONDS))
+@pytest.mark.parametrize('days', [1, 30, 365, 3650])
+def test_windows_cover_range_once(granularity, days):
+    gran_secs = GRANULARITY_SECONDS[granularity]
+    end_ts = 1_700_000_000 // gran_secs * gran_secs
+    start_ts = end_ts - days * 86400
+    windows = _request_windows(start_ts, end_ts, gran_secs, 5000)
+
+    # Contiguous and disjoint: each window starts right after the last one
+    assert windows[0][0] == start_ts
+    assert windows[-1][1] == end_ts - 1
+    for (_, prev_to), (lo, _) in zip(windows, windows[1:]):
+        assert lo == prev_to + 1
+
+    for lo, hi in windows:
+        assert lo <= hi
+        # Candle starts inside [lo, hi]: never more than one request's worth
+        assert (hi - lo) // gran_secs + 1 <= 5000
+
+
+def test_window_count():
+    # 365 days of M1 candles = 525600 candles = 106 requests of <= 5000
+    end_ts = 1_700_000_000 // 60 * 60
+    windows = _request_windows(end_ts - 365 * 86400, end_ts, 60, 5000)
+    assert len(windows) == 106
+
+
+def test_candles_per_day_matches_granularity():
+    assert 86400 // _granularity_seconds('M1') == 1440
+    assert 86400 // _granularity_seconds('H4') == 6
+    assert 7 * 86400 // _granularity_seconds('W') == 1
+
+
+def test_unknown_granularity():
+    with pytest.raises(ValueError):
+        _granularity_seconds('H5')
+
+
+def canned_candles(from_time: str, to_time: str) -> dict:
+    """
+    OANDA candles response with one M1 candle per minute of [from, to],
+    plus an incomplete candle that must be dropped
+    """
+    times = pd.date_range(from_time, to_time, freq='min')
+    candles = [
+        {'complete': True, 'volume': int(t.minute) + 1,
+         'time': t.strftime('%Y-%m-%dT%H:%M:%S.000000000Z'),
+         'mid': {'o': '1.10000', 'h': '1.10100', 'l': '1.09900', 'c': f'{1 + t.minute / 1000:.5f}'}}
+        for t in times
+    ]
+    candles.append(dict(candles[0], complete=False))
+    return {'instrument': 'EUR_USD', 'granularity': 'M1', 'candles': candles}
+
+
+def test_fetch_historical_data_merges_windows(monkeypatch):
+    monkeypatch.setenv('OANDA_API_KEY_MICRO', 'test-token')
+    monkeypatch.setenv('OANDA_ACCOUNT_ID_MICRO', '001-001-0000000-001')
+    monkeypatch.setenv('OANDA_ENVIRONMENT', 'practice')
+    windows = []
+
+    def make_client(account_type):
+        client = OandaClient(account_type=account_type)
+
+        def request(endpoint):
+            windows.append((endpoint.params['from'], endpoint.params['to']))
+            return canned_candles(endpoint.params['from'], endpoint.params['to'])
+
+        client.client.request = request
+        return client
+
+    monkeypatch.setattr(fetch_data, 'OandaClient', make_client)
+    # Hand the chunks back latest window first
+    monkeypatch.setattr(fetch_data, 'as_completed', lambda futures: reversed(futures))
+
+    # 4 days of M1 = 5760 candles, fetched as two windows
+    df = fetch_data.fetch_historical_data('EUR_USD', 'M1', days=4)
+
+    assert len(windows) == 2
+    assert list(df.columns) == CANDLE_COLUMNS
+    assert str(df['time'].dtype) == 'datetime64[ns, UTC]'
+    assert df['volume'].dtype == np.int64
+    for col in ('open', 'high', 'low', 'close'):
+        assert df[col].dtype == np.float64
+
+    # Every minute exactly once, in order, with its own values
+    expected = pd.date_range(min(windows)[0], periods=4 * 1440, freq='min')
+    assert df['time'].tolist() == list(expected)
+    np.testing.assert_array_equal(df['volume'], expected.minute + 1)
+    np.testing.assert_allclose(df['close'], 1 + expected.minute / 1000, rtol=0, atol=1e-12)
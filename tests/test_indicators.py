@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Check the compiled technical indicators against the pandas expressions
+they replace (rolling / ewm): value for value, except rolling standard
+deviations, which must agree to rounding
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.strategies.base_strategy import TechnicalIndicators
+
+from conftest import random_walk
+
+PERIODS = range(1, 31)
+
+
+def make_prices(kind: str, n: int = 400, seed: int = 0) -> pd.Series:
+    """
+    Build a random-walk price series with the given irregularities
+
+    Args:
+        kind: 'plain', 'nan' (NaN gaps), 'constant' (flat runs),
+            'inf' (+/-inf spikes) or 'mixed' (all of them)
+        n: Number of prices
+        seed: Random seed
+
+    Returns:
+        Price series
+    """
+    prices = random_walk(n, seed=seed, decimals=5)
+
+    if kind in ('constant', 'mixed'):
+        prices[50:90] = prices[50]
+        prices[200:203] = prices[200]
+    if kind in ('nan', 'mixed'):
+        prices[[0, 7, 8, 120]] = np.nan
+        prices[300:340] = np.nan
+    if kind in ('inf', 'mixed'):
+        prices[[30, 250]] = np.inf
+        prices[31] = -np.inf
+
+    return pd.Series(prices, name='close')
+
+
+def assert_same(actual: pd.Series, expected: pd.Series) -> None:
+    """Values must be identical, with NaN in the same places"""
+    np.testing.assert_array_equal(actual.to_numpy(), expected.to_numpy())
+
+
+def assert_close(actual: pd.Series, expected: pd.Series) -> None:
+    """
+    Values must agree to rounding, with NaN in the same places
+
+    For rolling variances, whose last bits depend on the pandas release:
+    roll_var's cancellation handling has changed within 2.x.
+    """
+    np.testing.assert_allclose(
+        actual.to_numpy(), expected.to_numpy(), rtol=1e-12, equal_nan=True
+    )
+
+
+KINDS = ['plain', 'nan', 'constant', 'inf', 'mixed']
+
+
+@pytest.mark.parametrize('kind', KINDS)
+def test_sma(kind):
+    data = make_prices(kind)
+    for period in PERIODS:
+        expected = data.rolling(window=period, min_periods=period).mean()
+        assert_same(TechnicalIndicators.sma(data, period), expected)
+
+
+@pytest.mark.parametrize('kind', KINDS)
+def test_ema(kind):
+    data = make_prices(kind)
+    for period in PERIODS:
+        expected = data.ewm(span=period, adjust=False, min_periods=period).mean()
+        assert_same(TechnicalIndicators.ema(data, period), expected)
+
+
+@pytest.mark.parametrize('kind', KINDS)
+def test_rsi(kind):
+    data = make_prices(kind)
+    delta = data.diff()
+    for period in PERIODS:
+        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+        expected = 100 - (100 / (1 + gain / loss))
+        assert_same(TechnicalIndicators.rsi(data, period), expected)
+
+
+@pytest.mark.parametrize('kind', KINDS)
+def test_atr(kind):
+    close = make_prices(kind)
+    rng = np.random.default_rng(1)
+    high = close + rng.uniform(0, 0.001, len(close))
+    low = close - rng.uniform(0, 0.001, len(close))
+
+    true_range = pd.concat([
+        high - low,
+        np.abs(high - close.shift()),
+        np.abs(low - close.shift())
+    ], axis=1).max(axis=1)
+    for period in PERIODS:
+        expected = true_range.rolling(window=period, min_periods=period).mean()
+        assert_same(TechnicalIndicators.atr(high, low, close, period), expected)
+
+
+@pytest.mark.parametrize('kind', KINDS)
+def test_bollinger_bands(kind):
+    data = make_prices(kind)
+    for period in PERIODS:
+        middle = data.rolling(window=period, min_periods=period).mean()
+        std = data.rolling(window=period, min_periods=period).std()
+        bands = TechnicalIndicators.bollinger_bands(data, period, 2.0)
+
+        assert_same(bands[0], middle)
+        assert_close(bands[1], middle + std * 2.0)
+        assert_close(bands[2], middle - std * 2.0)
+
+
+@pytest.mark.parametrize('kind', KINDS)
+def test_macd(kind):
+    data = make_prices(kind)
+    for fast, slow, signal in [(12, 26, 9), (5, 13, 4), (1, 2, 1)]:
+        macd_line = (
+            data.ewm(span=fast, adjust=False).mean()
+            - data.ewm(span=slow, adjust=False).mean()
+        )
+        signal_line = macd_line.ewm(span=signal, adjust=False).mean()
+        result = TechnicalIndicators.macd(data, fast, slow, signal)
+
+        assert_same(result[0], macd_line)
+        assert_same(result[1], signal_line)
+        assert_same(result[2], macd_line - signal_line)
+
+
+def test_short_input():
+    data = make_prices('plain', n=5)
+    assert TechnicalIndicators.sma(data, 20).isna().all()
+    assert TechnicalIndicators.ema(data, 20).isna().all()
+    assert TechnicalIndicators.bollinger_bands(data, 20)[0].isna().all()
+
+
+@pytest.mark.parametrize('period', [0, -1])
+def test_sma_rejects_bad_period(period):
+    with pytest.raises(ValueError):
+        TechnicalIndicators.sma(make_prices('plain'), period)
+
+
+@pytest.mark.parametrize('period', [0, -1])
+def test_atr_rejects_bad_period(period):
+    data = make_prices('plain')
+    with pytest.raises(ValueError):
+        TechnicalIndicators.atr(data, data, data, period)
+
+
+@pytest.mark.parametrize('period', [0, -1])
+def test_bollinger_bands_rejects_bad_period(period):
+    with pytest.raises(ValueError):
+        TechnicalIndicators.bollinger_bands(make_prices('plain'), period)
+
+
+@pytest.mark.parametrize('period', [0, -1])
+def test_rsi_rejects_bad_period(period):
+    with pytest.raises(ValueError):
+        TechnicalIndicators.rsi(make_prices('plain'), period)
+
+
+@pytest.mark.parametrize('period', [0, -1])
+def test_ema_rejects_bad_span(period):
+    with pytest.raises(ValueError):
+        TechnicalIndicators.ema(make_prices('plain'), period)
+
+
+@pytest.mark.parametrize('spans', [(0, 26, 9), (12, -1, 9), (12, 26, 0)])
+def test_macd_rejects_bad_span(spans):
+    with pytest.raises(ValueError):
+        TechnicalIndicators.macd(make_prices('plain'), *spans)
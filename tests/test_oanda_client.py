@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Check OandaClient's candle parsing, price polling, account cache and
+orjson request path against canned API responses (no network access)
+"""
+
+import sys
+import os
+import io
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import oandapyV20.endpoints.instruments as instruments
+from oandapyV20 import API
+from oandapyV20.exceptions import V20Error
+
+from src.api import oanda_client
+from src.api.oanda_client import CANDLE_COLUMNS, OandaClient, _API
+
+CANDLES_RESPONSE = {
+    'instrument': 'EUR_USD',
+    'granularity': 'H1',
+    'candles': [
+        {'complete': True, 'volume': 1200, 'time': '2024-01-02T00:00:00.000000000Z',
+         'mid': {'o': '1.10410', 'h': '1.10520', 'l': '1.10380', 'c': '1.10500'}},
+        {'complete': True, 'volume': 980, 'time': '2024-01-02T01:00:00.000000000Z',
+         'mid': {'o': '1.10500', 'h': '1.10600', 'l': '1.10450', 'c': '1.10455'}},
+        {'complete': False, 'volume': 15, 'time': '2024-01-02T02:00:00.000000000Z',
+         'mid': {'o': '1.10455', 'h': '1.10460', 'l': '1.10440', 'c': '1.10450'}}
+    ]
+}
+
+PRICES_RESPONSE = {
+    'time': '2024-01-02T10:00:00.000000000Z',
+    'prices': [
+        {'instrument': 'EUR_USD', 'time': '2024-01-02T09:59:58.123456789Z',
+         'bids': [{'price': '1.10450', 'liquidity': 10000000}],
+         'asks': [{'price': '1.10462', 'liquidity': 10000000}]},
+        {'instrument': 'USD_JPY', 'time': '2024-01-02T09:59:59.000000000Z',
+         'bids': [{'price': '141.250', 'liquidity': 10000000}],
+         'asks': [{'price': '141.266', 'liquidity': 10000000}]}
+    ]
+}
+
+ACCOUNT_RESPONSE = {
+    'account': {
+        'id': '001-001-0000000-001', 'currency': 'USD', 'balance': '1000.0000',
+        'NAV': '1002.5000', 'unrealizedPL': '2.5000', 'trades': [], 'positions': []
+    }
+}
+
+FILL_RESPONSE = {
+    'orderFillTransaction': {
+        'id': '6368', 'price': '1.10462', 'pl': '1.2000',
+        'time': '2024-01-02T10:00:01.000000000Z'
+    }
+}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """OandaClient with dummy credentials"""
+    monkeypatch.setenv('OANDA_API_KEY_MICRO', 'test-token')
+    monkeypatch.setenv('OANDA_ACCOUNT_ID_MICRO', '001-001-0000000-001')
+    monkeypatch.setenv('OANDA_ENVIRONMENT', 'practice')
+    return OandaClient(account_type='micro')
+
+
+def check_candles(candles: dict) -> None:
+    """Assert the columns, dtypes and values parsed from CANDLES_RESPONSE"""
+    assert list(candles) == CANDLE_COLUMNS
+    assert candles['time'].dtype == np.dtype('datetime64[ns]')
+    assert candles['volume'].dtype == np.int64
+    for col in ('open', 'high', 'low', 'close'):
+        assert candles[col].dtype == np.float64
+
+    # The incomplete candle is dropped
+    np.testing.assert_array_equal(
+        candles['time'],
+        np.array(['2024-01-02T00:00:00', '2024-01-02T01:00:00'], dtype='datetime64[ns]')
+    )
+    np.testing.assert_array_equal(candles['volume'], [1200, 980])
+    np.testing.assert_array_equal(candles['open'], [1.1041, 1.105])
+    np.testing.assert_array_equal(candles['high'], [1.1052, 1.106])
+    np.testing.assert_array_equal(candles['low'], [1.1038, 1.1045])
+    np.testing.assert_array_equal(candles['close'], [1.105, 1.10455])
+
+
+def test_get_candles(client):
+    requests = []
+
+    def request(endpoint):
+        requests.append(dict(endpoint.params))
+        return CANDLES_RESPONSE
+
+    client.client.request = request
+
+    check_candles(client.get_candles('EUR_USD', 'H1', count=3))
+    check_candles(client.get_candles(
+        'EUR_USD', 'H1', count=3,
+        from_time='2024-01-02T00:00:00Z', to_time='2024-01-02T02:59:59Z'
+    ))
+
+    # count is only sent when the range is open-ended
+    assert requests == [
+        {'granularity': 'H1', 'count': 3},
+        {'granularity': 'H1', 'from': '2024-01-02T00:00:00Z', 'to': '2024-01-02T02:59:59Z'}
+    ]
+
+
+def test_get_candles_drops_response(client):
+    def request(endpoint):
+        endpoint.response = CANDLES_RESPONSE
+        return CANDLES_RESPONSE
+
+    client.client.request = request
+
+    check_candles(client.get_candles('EUR_USD', 'H1', count=3))
+
+    # The reused endpoint does not keep the decoded body alive
+    [endpoint] = client._endpoints.cache.values()
+    assert endpoint.response is None
+
+
+def test_get_candles_stream_parse(client, monkeypatch):
+    monkeypatch.setattr(oanda_client, 'ijson', pytest.importorskip('ijson'))
+    closed = []
+
+    def request_raw(endpoint, stream=False):
+        assert stream
+        return SimpleNamespace(
+            raw=io.BytesIO(json.dumps(CANDLES_RESPONSE).encode()),
+            close=lambda: closed.append(True)
+        )
+
+    client.client.request_raw = request_raw
+
+    check_candles(client.get_candles('EUR_USD', 'H1', count=3, stream_parse=True))
+    assert closed == [True]
+
+
+def test_get_candles_error(client):
+    def request(endpoint):
+        raise V20Error(400, 'Invalid value specified for granularity')
+
+    client.client.request = request
+
+    assert client.get_candles('EUR_USD', 'H1') == {}
+
+
+def test_api_request_decodes_response(monkeypatch):
+    # _API reuses oandapyV20's private transport method
+    assert hasattr(API, '_API__request')
+
+    api = _API(access_token='test-token', environment='practice')
+    calls = []
+
+    def transport(method, url, request_args, headers=None, stream=False):
+        calls.append((method, url, request_args, stream))
+        return SimpleNamespace(
+            content=json.dumps(CANDLES_RESPONSE).encode(),
+            status_code=200
+        )
+
+    monkeypatch.setattr(api, '_API__request', transport)
+    endpoint = instruments.InstrumentsCandles(
+        instrument='EUR_USD', params={'granularity': 'H1', 'count': 3}
+    )
+
+    assert api.request(endpoint) == CANDLES_RESPONSE
+    assert endpoint.response == CANDLES_RESPONSE
+    assert endpoint.status_code == 200
+
+    [(method, url, request_args, stream)] = calls
+    assert method == 'get'
+    assert url.endswith('/v3/instruments/EUR_USD/candles')
+    assert request_args['params'] == {'granularity': 'H1', 'count': 3}
+    assert not stream
+
+
+def test_get_current_prices(client):
+    requests = []
+
+    def request(endpoint):
+        requests.append(dict(endpoint.params))
+        return PRICES_RESPONSE
+
+    client.client.request = request
+
+    prices = client.get_current_prices(['EUR_USD', 'USD_JPY'])
+
+    assert requests == [{'instruments': 'EUR_USD,USD_JPY'}]
+    assert set(prices) == {'EUR_USD', 'USD_JPY'}
+    eur = prices['EUR_USD']
+    assert eur['instrument'] == 'EUR_USD'
+    assert eur['time'] == '2024-01-02T09:59:58.123456789Z'
+    assert (eur['bid'], eur['ask']) == (1.1045, 1.10462)
+    assert eur['mid'] == pytest.approx(1.10456)
+    assert eur['spread'] == pytest.approx(0.00012)
+    jpy = prices['USD_JPY']
+    assert (jpy['bid'], jpy['ask']) == (141.25, 141.266)
+    assert jpy['mid'] == pytest.approx(141.258)
+    assert jpy['spread'] == pytest.approx(0.016)
+
+    assert client.get_current_price('USD_JPY') == jpy
+
+
+def test_get_current_price_missing_instrument(client):
+    client.client.request = lambda endpoint: PRICES_RESPONSE
+
+    assert client.get_current_price('GBP_USD') is None
+
+
+def test_get_current_price_error(client):
+    def request(endpoint):
+        raise V20Error(400, 'Invalid instrument')
+
+    client.client.request = request
+
+    assert client.get_current_prices(['EUR_USD']) == {}
+    assert client.get_current_price('EUR_USD') is None
+
+
+def test_get_current_prices_without_instruments(client):
+    def request(endpoint):
+        raise AssertionError('no request expected')
+
+    client.client.request = request
+
+    assert client.get_current_prices([]) == {}
+
+
+@pytest.fixture
+def account_requests(client):
+    """Serve canned account and order responses, recording endpoint names"""
+    names = []
+
+    def request(endpoint):
+        names.append(type(endpoint).__name__)
+        if names[-1] in ('OrderCreate', 'TradeClose'):
+            return FILL_RESPONSE
+        return ACCOUNT_RESPONSE
+
+    client.client.request = request
+    return names
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic for the account cache"""
+    now = [1000.0]
+    monkeypatch.setattr(oanda_client.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_account_lookups_are_cached(client, account_requests, clock):
+    summary = client.get_account_summary()
+    connection = client.test_connection()
+    assert connection['success'] and connection['balance'] == 1000.0
+
+    clock[0] += oanda_client.ACCOUNT_CACHE_TTL / 2
+    assert client.get_account_summary() == summary
+    assert client.test_connection() == connection
+    assert account_requests == ['AccountSummary', 'AccountDetails']
+
+
+def test_expired_account_lookups_are_refetched(client, account_requests, clock):
+    client.get_account_summary()
+    client.test_connection()
+
+    clock[0] += oanda_client.ACCOUNT_CACHE_TTL
+    client.get_account_summary()
+    client.test_connection()
+
+    assert account_requests == ['AccountSummary', 'AccountDetails'] * 2
+
+
+def test_failed_connection_is_not_cached(client, clock):
+    calls = []
+
+    def request(endpoint):
+        calls.append(endpoint)
+        if len(calls) == 1:
+            raise V20Error(503, 'Service unavailable')
+        return ACCOUNT_RESPONSE
+
+    client.client.request = request
+
+    assert not client.test_connection()['success']
+    assert client.test_connection()['success']
+    assert client.test_connection()['success']
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize('action', [
+    lambda client: client.place_market_order('EUR_USD', 1000),
+    lambda client: client.close_trade('6367')
+])
+def test_orders_invalidate_account_cache(client, account_requests, clock, action):
+    client.get_account_summary()
+    client.test_connection()
+
+    assert action(client)['success']
+    client.get_account_summary()
+    client.test_connection()
+
+    assert account_requests.count('AccountSummary') == 2
+    assert account_requests.count('AccountDetails') == 2
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Check the alternative SMA crossover signal paths (streaming and batch)
+against SMACrossoverStrategy.run()
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.strategies._kernels import trade_walk_kernel
+from src.strategies.sma_crossover import SMACrossoverStrategy, batch_backtest
+
+from conftest import random_walk
+
+PARAMS = [(2, 3, 1), (5, 20, 1), (5, 20, 3), (20, 50, 1), (20, 50, 5), (1, 4, 2)]
+
+
+def make_candles(n: int = 1500, seed: int = 0, gaps: bool = True) -> pd.DataFrame:
+    """
+    Build random-walk candles, optionally with missing close prices
+
+    Args:
+        n: Number of candles
+        seed: Random seed
+        gaps: Put NaN closes (single bars and a longer run) into the data
+
+    Returns:
+        DataFrame with time, open, high, low, close, volume columns
+    """
+    close = random_walk(n, seed=seed, scale=0.0008, decimals=5)
+    close[300:340] = close[300]
+    if gaps:
+        close[[10, 500, 501]] = np.nan
+        close[900:960] = np.nan
+
+    return pd.DataFrame({
+        'time': pd.date_range('2024-01-01', periods=n, freq='h', tz='UTC'),
+        'open': close,
+        'high': close + 0.0005,
+        'low': close - 0.0005,
+        'close': close,
+        'volume': np.random.default_rng(seed).integers(1, 1000, n)
+    })
+
+
+def run_signals(candles: pd.DataFrame, params) -> np.ndarray:
+    """Signal column of a full run() over the candles"""
+    strategy = SMACrossoverStrategy(*params)
+    strategy.load_data(candles)
+    return strategy.run()['signal'].to_numpy()
+
+
+@pytest.mark.parametrize('params', PARAMS)
+def test_push_matches_run(params):
+    candles = make_candles()
+    strategy = SMACrossoverStrategy(*params)
+    pushed = np.array([strategy.push(px) for px in candles['close']])
+
+    np.testing.assert_array_equal(pushed, run_signals(candles, params))
+
+
+def test_reset_stream():
+    candles = make_candles(n=400, gaps=False)
+    strategy = SMACrossoverStrategy(5, 20, 2)
+    for px in candles['close'].iloc[::-1]:
+        strategy.push(px)
+
+    strategy.reset_stream()
+    pushed = np.array([strategy.push(px) for px in candles['close']])
+
+    np.testing.assert_array_equal(pushed, run_signals(candles, (5, 20, 2)))
+
+
+def test_run_shares_price_columns():
+    candles = make_candles(gaps=False)
+    strategy = SMACrossoverStrategy(5, 20)
+    strategy.load_data(candles)
+    signals = strategy.run()
+
+    # Indicator columns are added alongside the borrowed prices, not by
+    # copying the frame
+    for column in ('open', 'high', 'low', 'close'):
+        assert np.shares_memory(signals[column].to_numpy(), candles[column].to_numpy())
+    assert 'sma_short' not in candles.columns
+
+
+@pytest.mark.parametrize('params', [(0, 20), (-1, 20), (20, 20)])
+def test_strategy_rejects_invalid_params(params):
+    with pytest.raises(ValueError):
+        SMACrossoverStrategy(*params)
+
+
+def test_strategy_zero_confirmation_means_none():
+    candles = make_candles()
+    expected = run_signals(candles, (5, 20, 1))
+
+    np.testing.assert_array_equal(run_signals(candles, (5, 20, 0)), expected)
+    strategy = SMACrossoverStrategy(5, 20, 0)
+    pushed = np.array([strategy.push(px) for px in candles['close']])
+    np.testing.assert_array_equal(pushed, expected)
+
+
+def test_batch_backtest_matches_run():
+    candles = make_candles()
+    signals = batch_backtest(candles['close'], PARAMS)
+
+    assert signals.shape == (len(PARAMS), len(candles))
+    for row, params in zip(signals, PARAMS):
+        np.testing.assert_array_equal(row, run_signals(candles, params))
+
+
+def test_batch_backtest_two_element_params():
+    candles = make_candles(gaps=False)
+    signals = batch_backtest(candles['close'].to_numpy(), [(5, 20)])
+
+    np.testing.assert_array_equal(signals[0], run_signals(candles, (5, 20, 1)))
+
+
+@pytest.mark.parametrize('params', [(0, 3), (-1, 3, 1), (5, 5), (8, 3)])
+def test_batch_backtest_rejects_invalid_params(params):
+    with pytest.raises(ValueError):
+        batch_backtest(make_candles(n=400, gaps=False)['close'], [(5, 20), params])
+
+
+def test_batch_backtest_zero_confirmation_means_none():
+    close = make_candles()['close']
+    signals = batch_backtest(close, [(5, 20, 0), (5, 20, 1)])
+
+    np.testing.assert_array_equal(signals[0], signals[1])
+
+
+def reference_trades(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pair signals the way get_entry_exit_pairs originally did, row by row
+
+    The first signal opens a position and each opposite signal closes it
+    and opens the reverse one.
+    """
+    trades = []
+    position = None
+    for row in data[data['signal'] != 0].itertuples():
+        if position is None:
+            position = 'long' if row.signal == 1 else 'short'
+        elif (position == 'long' and row.signal == -1) or (position == 'short' and row.signal == 1):
+            if position == 'long':
+                move = row.close - entry_price
+            else:
+                move = entry_price - row.close
+            trades.append({
+                'entry_time': entry_time,
+                'entry_price': entry_price,
+                'exit_time': row.time,
+                'exit_price': row.close,
+                'position_type': position,
+                'pips_profit': move * 10000,
+                'percent_profit': (move / entry_price) * 100
+            })
+            position = 'short' if position == 'long' else 'long'
+        else:
+            continue
+        entry_price = row.close
+        entry_time = row.time
+
+    return pd.DataFrame(trades)
+
+
+@pytest.mark.parametrize('params', PARAMS)
+def test_entry_exit_pairs_match_reference(params):
+    strategy = SMACrossoverStrategy(*params)
+    strategy.load_data(make_candles())
+    strategy.run()
+
+    trades = strategy.get_entry_exit_pairs()
+    assert len(trades) > 0
+    pd.testing.assert_frame_equal(trades, reference_trades(strategy.data))
+
+
+def test_trade_walk_kernel():
+    signal = np.array([0, 1, 1, 0, -1, -1, 1, 0, -1], dtype=np.int8)
+    close = np.array([1.0, 1.1, 1.2, 1.3, 1.4, 1.5, 1.2, 1.1, 1.3])
+
+    (entry_idx, exit_idx, direction, entry_price, exit_price,
+     pips_profit, percent_profit) = trade_walk_kernel(signal, close)
+
+    # Repeated same-direction signals (bars 2 and 5) are ignored
+    np.testing.assert_array_equal(entry_idx, [1, 4, 6])
+    np.testing.assert_array_equal(exit_idx, [4, 6, 8])
+    np.testing.assert_array_equal(direction, [1, -1, 1])
+    np.testing.assert_array_equal(entry_price, close[[1, 4, 6]])
+    np.testing.assert_array_equal(exit_price, close[[4, 6, 8]])
+    np.testing.assert_allclose(pips_profit, [3000, 2000, 1000])
+    np.testing.assert_allclose(percent_profit, [0.3 / 1.1 * 100, 0.2 / 1.4 * 100, 0.1 / 1.2 * 100])
+
+
+def test_trade_walk_kernel_without_trades():
+    close = np.ones(4)
+    for signal in ([0, 0, 0, 0], [0, 1, 0, 1], [-1, 0, 0, 0]):
+        result = trade_walk_kernel(np.array(signal, dtype=np.int8), close)
+        assert all(len(column) == 0 for column in result)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Check the bulk time formatter against the text pandas' to_csv writes
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.time_format import format_utc_times
+
+
+def csv_times(time: pd.Series) -> list:
+    """Time column text as written by DataFrame.to_csv"""
+    text = pd.DataFrame({'time': time}).to_csv(index=False)
+    return text.splitlines()[1:]
+
+
+def test_matches_to_csv():
+    for unit in ('s', 'us', 'ns'):
+        time = pd.Series(
+            pd.date_range('2024-01-01 22:00', periods=50, freq='h', tz='UTC')
+        ).dt.as_unit(unit)
+        assert format_utc_times(time).tolist() == csv_times(time)
+
+
+def test_midnight_times_keep_their_clock():
+    time = pd.Series(pd.date_range('2024-01-01', periods=5, freq='D', tz='UTC'))
+    assert format_utc_times(time).tolist() == csv_times(time)
+    assert format_utc_times(time)[0] == '2024-01-01 00:00:00+00:00'
+
+
+def test_empty_column():
+    time = pd.Series(pd.DatetimeIndex([], tz='UTC'))
+    assert format_utc_times(time) is None
+
+
+def test_leaves_other_times_to_pandas():
+    utc = pd.Series(pd.date_range('2024-01-01', periods=5, freq='h', tz='UTC'))
+
+    assert format_utc_times(utc.dt.tz_convert(None)) is None
+    assert format_utc_times(utc.dt.tz_convert('US/Eastern')) is None
+    assert format_utc_times(utc + pd.Timedelta(milliseconds=1)) is None
+    assert format_utc_times(pd.Series(np.arange(5))) is None
+
+    with_nat = utc.copy()
+    with_nat.iloc[2] = pd.NaT
+    assert format_utc_times(with_nat) is None